@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Replay Benchmark (Linux & Windows)           #
+# Description:  Measures speed, latency and accuracy of the toolkit on recorded utterances.        #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:49/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# Replays a folder of labelled utterances through the toolkit, spread over several processes (each
+# one loads its own Vosk model once). No microphone and no X server needed.
+#
+# Every audio file (*.wav, *.flac, or *.raw with -r) can have a label file with the same name and ".txt"
+# next to it, holding the phrase that was spoken - an empty or missing label means "no command".
+#
+#   python3 bench_replay.py utterances/ -m model -j 4 --grammar --vad --blocksize 4000
+#   python3 bench_replay.py utterances-de/ -m models/de-DE --locale de-DE
+#
+# Reported:
+# - RTF:      decode time / audio duration (< 1 is faster than real time)
+# - latency:  end of the utterance -> command dispatched, in audio time (block size, endpointing and
+#             VAD hangover included), negative if it fired before the end (--early)
+# - decode:   wall time of the decode call that dispatched a command (comes on top of the latency live)
+# - accuracy: utterances that ran exactly the labelled command (or nothing, if none was labelled)
+
+import argparse
+import glob
+import json
+import math
+import multiprocessing
+import os
+import sys
+
+import f360_commands
+import f360_pipeline
+import f360_replay
+
+
+_model = None
+_commands = None
+_options = None
+
+
+def _init(model_path, command_files, options):
+    """Runs once in every worker process."""
+    global _model, _commands, _options
+    import vosk
+    vosk.SetLogLevel(-1)
+    _model = vosk.Model(model_path)
+    _commands = f360_commands.CommandTable.for_locale(options.locale, *command_files)
+    _options = options
+
+
+def _label(path):
+    try:
+        with open(os.path.splitext(path)[0] + ".txt", encoding="utf-8") as f:
+            return f360_commands.normalize(f.read())
+    except OSError:
+        return ""
+
+
+def _steps(commands):
+    """What the commands do, as one list of (action, args) - a macro may also run in parts (--early)."""
+    return [step for command in commands for step in command.steps()]
+
+
+def _run(path):
+    result = f360_replay.replay(_model, _commands, path, _options)
+    label = _label(path)
+    expected = _commands.lookup(label) if label else None
+    got = [command for dispatched, command in result.commands]
+    return {
+        "path": path,
+        "label": label,
+        "got": [command.phrase for command in got],
+        "correct": _steps(got) == _steps([expected] if expected is not None else []),
+        "audio": result.audio,
+        "decode": result.decode,
+        "latencies": result.latencies(),
+        "processing": result.processing,
+        "counters": result.counters,
+    }
+
+
+def percentile(values, p):
+    """p-th percentile (nearest rank) of a list of numbers."""
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[max(0, int(math.ceil(p / 100.0 * len(values))) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay benchmark for the speech toolkit")
+    parser.add_argument('directory', help='folder with the utterances (*.wav, *.flac, *.raw) and their labels (*.txt)')
+    parser.add_argument('-m', '--model', type=str, default='model', metavar='MODEL_PATH', help='Path to the model')
+    parser.add_argument('--locale', type=str, default=f360_commands.DEFAULT_LOCALE,
+                        help='language of the commands and the labels, e.g. de-DE (default: %(default)s)')
+    parser.add_argument('-r', '--samplerate', type=int, help='sampling rate of the raw files')
+    parser.add_argument('-c', '--commands', type=str, metavar='FILE', action='append', default=[],
+                        help='additional command file (JSON), can be used several times')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='worker processes, each with its own model (default: number of CPUs)')
+    parser.add_argument('--json', type=str, metavar='FILE', help='write the results of every utterance to FILE')
+    f360_pipeline.add_recognition_arguments(parser)
+    args = parser.parse_args()
+    try:
+        f360_commands.CommandTable.for_locale(args.locale, *args.commands)
+    except f360_commands.CommandError as e:
+        parser.exit(1, "%s\n" % e)
+
+    files = sorted(glob.glob(os.path.join(args.directory, "*.wav")))
+    files += sorted(glob.glob(os.path.join(args.directory, "*.flac")))
+    if args.samplerate is not None:
+        files += sorted(glob.glob(os.path.join(args.directory, "*.raw")))
+    if not files:
+        parser.exit(1, "No utterances found in %s\n" % args.directory)
+
+    with multiprocessing.Pool(args.jobs, _init, (args.model, args.commands, args)) as pool:
+        results = []
+        for result in pool.imap_unordered(_run, files):
+            results.append(result)
+            if not result["correct"]:
+                print("MISS %s: expected '%s', got %s" % (result["path"], result["label"], result["got"]),
+                      file=sys.stderr)
+
+    audio = sum(result["audio"] for result in results)
+    decode = sum(result["decode"] for result in results)
+    latencies = [latency for result in results for latency in result["latencies"]]
+    processing = [took for result in results for took in result["processing"]]
+    correct = sum(1 for result in results if result["correct"])
+
+    print("Utterances: %d (%.1f s audio, %d workers)" % (len(results), audio, args.jobs))
+    print("RTF:        %.3f" % (decode / audio if audio else 0.0))
+    print("Latency:    p50 %.0f ms, p90 %.0f ms, p99 %.0f ms, max %.0f ms" % tuple(
+        1000 * value for value in (percentile(latencies, 50), percentile(latencies, 90),
+                                   percentile(latencies, 99), max(latencies) if latencies else float("nan"))))
+    print("Decode:     p50 %.0f ms, p99 %.0f ms per dispatching call" % (
+        1000 * percentile(processing, 50), 1000 * percentile(processing, 99)))
+    print("Accuracy:   %.1f%% (%d/%d)" % (100.0 * correct / len(results), correct, len(results)))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
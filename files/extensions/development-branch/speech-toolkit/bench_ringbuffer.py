@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Ring Buffer Benchmark (Linux & Windows)      #
+# Description:  Compares the allocations of the old audio queue with the preallocated ring.        #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:46/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# Runs the capture path (audio callback -> queue -> recognizer) without a microphone or Vosk:
+#
+#   queue: the old way, bytes(indata) into an unbounded queue.Queue
+#   ring:  f360_pipeline.AudioRing
+#   vosk:  the ring plus the hand-off to Vosk that Recognizer.accept does for every block. With
+#          cffi that is ffi.from_buffer - no copy of the audio, but one small wrapper object per
+#          block. Without cffi the recognizer has to copy the block with bytes().
+#
+# For every block the memory that was allocated on top of the current use is measured with
+# tracemalloc, then the numbers are scaled to the block rate of the given sample rate.
+#
+#   python3 bench_ringbuffer.py --samplerate 48000 --blocksize 8000 --blocks 5000
+
+import argparse
+import queue
+import time
+import tracemalloc
+
+import f360_pipeline
+
+
+class QueuePath(object):
+    """The capture path before the ring buffer."""
+
+    def __init__(self, blocksize):
+        self.q = queue.Queue()
+
+    def put(self, indata):
+        self.q.put(bytes(indata))
+
+    def get(self):
+        return self.q.get()
+
+
+class RingPath(object):
+
+    def __init__(self, blocksize):
+        self.ring = f360_pipeline.AudioRing(20, blocksize)
+
+    def put(self, indata):
+        self.ring.put(indata)
+
+    def get(self):
+        return self.ring.get()
+
+
+def handoff():
+    """(name, function) of the conversion Recognizer.accept applies before AcceptWaveform."""
+    try:
+        import vosk
+        ffi = getattr(vosk, "_ffi", None)
+    except ImportError:
+        ffi = None
+    if ffi is None:
+        try:
+            import cffi
+            ffi = cffi.FFI()
+        except ImportError:
+            return "bytes", bytes
+    return "from_buffer", ffi.from_buffer
+
+
+class VoskPath(RingPath):
+
+    def __init__(self, blocksize):
+        super(VoskPath, self).__init__(blocksize)
+        self.name, self.wrap = handoff()
+
+    def get(self):
+        return self.wrap(self.ring.get())
+
+
+PATHS = (("queue", QueuePath), ("ring", RingPath), ("vosk", VoskPath))
+
+
+def measure(path, indata, blocks):
+    """Return (seconds per block, allocating blocks, allocated bytes) for a capture path."""
+    for _ in range(100):
+        path.put(indata)
+        path.get()
+
+    start = time.perf_counter()
+    for _ in range(blocks):
+        path.put(indata)
+        path.get()
+    per_block = (time.perf_counter() - start) / blocks
+
+    allocating = 0
+    allocated = 0
+    tracemalloc.start()
+    try:
+        for _ in range(blocks):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            path.put(indata)
+            path.get()
+            extra = tracemalloc.get_traced_memory()[1] - current
+            if extra > 0:
+                allocating += 1
+                allocated += extra
+    finally:
+        tracemalloc.stop()
+    return per_block, allocating, allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Allocation benchmark for the audio capture path")
+    parser.add_argument('-r', '--samplerate', type=int, default=16000, help='sampling rate (default: 16000)')
+    parser.add_argument('--blocksize', type=int, default=8000, help='frames per audio block (default: 8000)')
+    parser.add_argument('-n', '--blocks', type=int, default=2000, help='blocks per run (default: 2000)')
+    args = parser.parse_args()
+
+    # Stands in for the cffi buffer that sounddevice hands to the callback:
+    indata = memoryview(bytearray(args.blocksize * 2))
+    rate = args.samplerate / float(args.blocksize)
+
+    print('%d Hz, %d frames per block = %.1f blocks/s' % (args.samplerate, args.blocksize, rate))
+    print('%-6s %12s %16s %16s' % ('path', 'us/block', 'allocating/s', 'bytes/s'))
+    for name, cls in PATHS:
+        path = cls(args.blocksize)
+        per_block, allocating, allocated = measure(path, indata, args.blocks)
+        print('%-6s %12.2f %16.1f %16.0f' % (
+            name, per_block * 1e6, allocating * rate / args.blocks, allocated * rate / args.blocks))
+    print('vosk = ring + the hand-off to Vosk (%s)' % path.name)
+
+
+if __name__ == '__main__':
+    main()
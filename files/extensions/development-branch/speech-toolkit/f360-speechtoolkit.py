@@ -12,16 +12,23 @@
 ####################################################################################################
 
 import argparse
+import json
 import os
-import queue
-import sounddevice as sd
-import vosk
+import signal
 import sys
-import json
-import subprocess
+import threading
+import f360_commands
+import f360_control
+import f360_inject
+import f360_macros
+import f360_models
+import f360_pipeline
+import f360_recorder
+import f360_replay
+import f360_stats
 
 
-q = queue.Queue()
+capture = None
 
 def int_or_str(text):
     """Helper function for argument parsing."""
@@ -30,11 +37,20 @@ def int_or_str(text):
     except ValueError:
         return text
 
+def preload(models, locales):
+    """Load models in the background."""
+    for locale in locales:
+        try:
+            models.get(locale)
+            print('Model loaded: ' + locale)
+        except f360_models.ModelError as e:
+            print(e, file=sys.stderr)
+
 def callback(indata, frames, time, status):
     """This is called (from a separate thread) for each audio block."""
     if status:
         print(status, file=sys.stderr)
-    q.put(bytes(indata))
+    capture.put(indata)
 
 parser = argparse.ArgumentParser(add_help=False)
 parser.add_argument(
@@ -42,6 +58,7 @@ parser.add_argument(
     help='show list of audio devices and exit')
 args, remaining = parser.parse_known_args()
 if args.list_devices:
+    import sounddevice as sd
     print(sd.query_devices())
     parser.exit(0)
 parser = argparse.ArgumentParser(
@@ -50,17 +67,119 @@ parser = argparse.ArgumentParser(
     parents=[parser])
 parser.add_argument(
     '-f', '--filename', type=str, metavar='FILENAME',
-    help='audio file to store recording to')
+    help='record the audio to FILENAME-0001.wav, FILENAME-0002.wav, ... (written in the background)')
 parser.add_argument(
     '-m', '--model', type=str, metavar='MODEL_PATH',
     help='Path to the model')
+parser.add_argument(
+    '--locale', type=str, default=f360_commands.DEFAULT_LOCALE,
+    help='language of the commands and of --model, e.g. de-DE (default: %(default)s)')
+parser.add_argument(
+    '--models-dir', type=str, default='models', metavar='DIR',
+    help='folder with one model folder per locale (models/de-DE, ...) for the language switch of --daemon')
+parser.add_argument(
+    '--model-cache-mb', type=float, default=2048, metavar='MB',
+    help='keep the recently used models in memory up to this size, 0 = no limit (default: 2048)')
+parser.add_argument(
+    '--preload', type=str, metavar='LOCALE', nargs='+', default=[],
+    help='load the models of these locales in the background, so switching to them is instant')
 parser.add_argument(
     '-d', '--device', type=int_or_str,
     help='input device (numeric ID or substring)')
 parser.add_argument(
     '-r', '--samplerate', type=int, help='sampling rate')
+parser.add_argument(
+    '-b', '--backend', type=str, default='auto',
+    choices=['auto'] + list(f360_inject.BACKENDS),
+    help='how the key chords and clicks are sent to Fusion 360 (default: auto)')
+parser.add_argument(
+    '--scripts-dir', type=str, metavar='DIR',
+    help='folder with keypress.sh and cube_view_*.sh for the shell backend')
+parser.add_argument(
+    '--window-title', type=str, default='Autodesk Fusion', metavar='TEXT',
+    help='title of the Fusion 360 window, the targets (ViewCube, ...) are clicked relative to it')
+parser.add_argument(
+    '--targets', type=str, metavar='FILE',
+    help='file with the learned target offsets (default: ~/.config/f360-speechtoolkit/targets.json)')
+parser.add_argument(
+    '--calibrate', type=str, metavar='TARGET', nargs='*',
+    help='learn the offsets of these targets (default: all known) from the mouse position and exit')
+parser.add_argument(
+    '-c', '--commands', type=str, metavar='FILE', action='append', default=[],
+    help='additional command file (JSON), can be used several times and overrides the default commands')
+f360_pipeline.add_recognition_arguments(parser)
+parser.add_argument(
+    '--queue-size', type=int, default=20, metavar='BLOCKS',
+    help='audio blocks that can wait for the recognizer before the oldest is dropped (default: 20)')
+parser.add_argument(
+    '--action-timeout', type=float, default=2.0, metavar='SECONDS',
+    help='drop or abort actions that take longer than this, 0 = no limit (default: 2.0)')
+parser.add_argument(
+    '--record-format', type=str, choices=f360_recorder.FORMATS,
+    help='format of the recordings, flac needs the soundfile module (default: extension of --filename or wav)')
+parser.add_argument(
+    '--record-segment', type=float, default=600, metavar='SECONDS',
+    help='start a new recording file after this many seconds, 0 = never (default: 600)')
+parser.add_argument(
+    '--record-max-mb', type=float, metavar='MB',
+    help='start a new recording file when it reaches this size')
+parser.add_argument(
+    '--record-speech-only', action='store_true',
+    help='only keep the utterances, one file each with the recognized command in a .txt label next to it')
+parser.add_argument(
+    '--replay', type=str, metavar='FILE', nargs='+',
+    help='decode recorded WAV, FLAC or raw files (see --filename) instead of the microphone, nothing is sent to Fusion 360')
+parser.add_argument(
+    '--stats-socket', type=str, metavar='PATH', nargs='?', const=f360_stats.default_socket(),
+    help='serve latency statistics (Prometheus /metrics and JSON /stats) over HTTP on a Unix socket')
+parser.add_argument(
+    '--stats-file', type=str, metavar='FILE',
+    help='write the latency statistics as JSON to FILE on exit')
+parser.add_argument(
+    '--daemon', action='store_true',
+    help='keep the model and the audio stream open and take commands on the control socket (see --control)')
+parser.add_argument(
+    '--control-socket', type=str, metavar='PATH', default=f360_stats.default_socket('f360-speechtoolkit.sock'),
+    help='Unix socket of --daemon and --control (default: %(default)s)')
+parser.add_argument(
+    '--control', type=str, metavar='COMMAND', nargs='+',
+    help='send a command to the running daemon and exit: status, pause, resume, workspace NAME, '
+         'commands [FILE ...], reload, language LOCALE or stop')
 args = parser.parse_args(remaining)
 
+if args.control:
+    # The thin client: no model, no audio.
+    if args.control[0] == 'commands':
+        # The daemon runs in another folder, it needs the full paths:
+        args.control[1:] = [os.path.abspath(path) for path in args.control[1:]]
+    try:
+        result = f360_control.request(args.control_socket, *args.control)
+    except f360_control.ControlError as e:
+        parser.exit(1, str(e) + '\n')
+    print(result if isinstance(result, str) else json.dumps(result, indent=2))
+    parser.exit(0)
+
+if args.calibrate is not None:
+    try:
+        tracker = f360_macros.get_tracker(args.window_title)
+        if tracker is None:
+            parser.exit(1, 'The calibration needs python-xlib or xdotool\n')
+        targets = f360_macros.Targets(args.targets)
+        f360_macros.calibrate(tracker, targets, args.calibrate or targets.names(tracker.layout()))
+    except (KeyboardInterrupt, EOFError):
+        parser.exit(1, '\nCalibration aborted\n')
+    except f360_inject.InjectionError as e:
+        parser.exit(1, str(e) + '\n')
+    parser.exit(0)
+
+backend = None
+rec = None
+worker = None
+recorder = None
+stats = None
+stats_server = None
+control_server = None
+error = None
 try:
     if args.model is None:
         args.model = "model"
@@ -68,278 +187,145 @@ try:
         print ("Please download a model for your language from https://alphacephei.com/vosk/models")
         print ("and unpack as 'model' in the current folder.")
         parser.exit(0)
-    if args.samplerate is None:
+    if args.daemon:
+        # Fail before the model is loaded if another daemon is running:
+        f360_stats.claim_socket(args.control_socket)
+    if args.samplerate is None and not args.replay:
+        import sounddevice as sd
         device_info = sd.query_devices(args.device, 'input')
         # soundfile expects an int, sounddevice provides a float:
         args.samplerate = int(device_info['default_samplerate'])
 
-    model = vosk.Model(args.model)
+    commands = f360_commands.CommandTable.for_locale(args.locale, *args.commands)
+    print('Loaded %d voice commands (%s)' % (len(commands), args.locale))
 
-    if args.filename:
-        dump_fn = open(args.filename, "wb")
+    # Vosk takes a while to import and the model even longer, so only now:
+    models = f360_models.ModelManager(args.models_dir, budget=int(args.model_cache_mb * 1024 * 1024) or None,
+                                      paths={args.locale: args.model})
+    model = models.get(args.locale)
+    models.activate(args.locale)
+
+    if args.replay:
+        for path in args.replay:
+            result = f360_replay.replay(model, commands, path, args, verbose=True)
+            print('%s: %.1f s audio decoded in %.2f s (RTF %.3f), %d commands' % (
+                path, result.audio, result.decode, result.rtf, len(result.commands)))
+            for (position, command), latency, took in zip(result.commands, result.latencies(), result.processing):
+                print('  %7.2f s  %s (%+.0f ms after the speech, %.0f ms decoding)' % (
+                    position, command.phrase, 1000 * latency, 1000 * took))
+        parser.exit(0)
+
+    if args.backend == 'record':
+        backend = f360_inject.get_backend('record', verbose=True)
+    elif args.backend in ('auto', 'shell'):
+        backend = f360_inject.get_backend(args.backend, scripts_dir=args.scripts_dir)
     else:
-        dump_fn = None
+        backend = f360_inject.get_backend(args.backend)
+    print('Injection backend: ' + backend.name)
+    # The dry run records the targets by name, it needs no Fusion 360 window:
+    tracker = f360_macros.get_tracker(args.window_title) if args.backend != 'record' else None
+    if tracker is not None:
+        backend = f360_macros.MacroBackend(backend, tracker, f360_macros.Targets(args.targets))
+    elif args.backend != 'record':
+        print('Neither python-xlib nor xdotool found, the ViewCube commands are disabled', file=sys.stderr)
 
-    with sd.RawInputStream(samplerate=args.samplerate, blocksize = 8000, device=args.device, dtype='int16', channels=1, callback=callback):
-            print('#' * 80)
-            print('Press Ctrl+C to stop the recording')
-            print('#' * 80)
+    if args.filename:
+        fmt = args.record_format or os.path.splitext(args.filename)[1].lstrip('.').lower()
+        recorder = f360_recorder.Recorder(
+            args.filename, args.samplerate, fmt if fmt in f360_recorder.FORMATS else 'wav',
+            segment_seconds=args.record_segment,
+            max_bytes=int(args.record_max_mb * 1024 * 1024) if args.record_max_mb else None,
+            speech_only=args.record_speech_only)
+        print('Recording to %s-*.%s' % (recorder.base, recorder.format))
 
-            rec = vosk.KaldiRecognizer(model, args.samplerate)
-            while True:
-                data = q.get()
-                if rec.AcceptWaveform(data):
+    if args.stats_socket or args.stats_file:
+        stats = f360_stats.Stats()
 
-                    # Get JSON
-                    vc = json.loads(rec.Result())
+    capture = f360_pipeline.AudioRing(args.queue_size, args.blocksize, timestamps=stats is not None)
+    executor = f360_pipeline.ActionExecutor(backend, timeout=args.action_timeout or None, stats=stats)
+    worker = f360_pipeline.build_worker(model, args.samplerate, commands, capture, executor, args,
+                                        recorder=recorder, stats=stats)
+    rec = worker.recognizer
 
-					# Here you get more informations about the shortcut configuration in Autodesk Fusion 360: 
-					# - https://help.autodesk.com/view/fusion360/ENU/?guid=GUID-F0491540-0324-470A-B651-2238D0EFAC30
-					# - https://help.autodesk.com/view/fusion360/ENU/?guid=GUID-E8541F92-A2DA-4CBF-A708-5374679B3F35
+    if stats is not None:
+        stats.add_counters('recognizer', rec.counters)
+        stats.add_counters('actions', executor.counters)
+        stats.add_counters('audio', lambda: {'overruns': capture.overruns, 'queued': len(capture)},
+                           gauges=('queued',))
+        if recorder is not None:
+            stats.add_counters('recorder', recorder.counters)
+        if worker.gate is not None:
+            stats.add_counters('vad', lambda: {'blocks': worker.gate.blocks, 'skipped': worker.gate.skipped})
+    if args.stats_socket:
+        stats_server = f360_stats.StatsServer(stats, args.stats_socket)
+        stats_server.start()
+        print('Statistics: ' + args.stats_socket)
+    if args.daemon:
+        controller = f360_control.Controller(worker, args.commands, info={
+            'samplerate': args.samplerate, 'backend': backend.name, 'pid': os.getpid()},
+            models=models, locale=args.locale)
+        control_server = f360_control.ControlServer(controller, args.control_socket)
+        control_server.start()
+        # systemd and kill stop the daemon like Ctrl+C:
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        print('Control socket: ' + args.control_socket)
 
-                    # --------------------------------------------------------------------------------------------------------------------------
-                    # Controll Autodesk Fusion 360 via voice assistant - Shortcuts:
-                    # --------------------------------------------------------------------------------------------------------------------------
-                    
-                    # System Keyboard Shortcuts:
-                                       
-                    if vc['text'] == "fusion new project":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+n"])
-                        # Command: File > New Design
-                    if vc['text'] == "fusion open project":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+o"])
-                        # Command: File > Open
-                    if vc['text'] == "fusion save project":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+s"])
-                        # Command: File > Save (Version)
-                    if vc['text'] == "fusion recovery save project":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+shift+s"])
-                        # Command: Recovery Save
-                    if vc['text'] == "fusion new tab":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+tab"])
-                        # Command: Cycle open document tabs
-                    if vc['text'] == "fusion refresh data panel":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "F5"])
-                        # Command: Refresh data panel
-                    
-                    # --------------------------------------------------------------------------------------------------------------------------
-                    
-                    # General Keyboard Shortcuts:
-                                       
-                    if vc['text'] == "fusion four view ports":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "shift+1"])
-                        # Command: Display 4 viewports
-                    if vc['text'] == "fusion for view ports":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "shift+1"])
-                        # Command: Display 4 viewports
-                    if vc['text'] == "fusion visual style four":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+4"])
-                        # Command: Visual Styles (Shaded)
-                    if vc['text'] == "fusion visual style for":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+4"])
-                        # Command: Visual Styles (Shaded)
-                    if vc['text'] == "fusion visual style five":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+5"])
-                        # Command: Visual Styles (Shaded with hidden edges)
-                    if vc['text'] == "fusion visual style six":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+6"])
-                        # Command: Visual Styles (Shaded with visible edges only)
-                    if vc['text'] == "fusion visual style seven":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+7"])
-                        # Command: Visual Styles (Wireframe)
-                    if vc['text'] == "fusion visual style eight":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+8"])
-                        # Command: Visual Styles (Wireframe with hidden edges)
-                    if vc['text'] == "fusion visual style nine":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+9"])
-                        # Command: Visual Styles (Wireframe with visible edges only)
-                    if vc['text'] == "fusion fullscreen":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+shift+f"])
-                        # Command: Full-screen mode
-                    if vc['text'] == "fusion view cube":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+alt+v"])
-                        # Command: Show/hide ViewCube
-                    if vc['text'] == "fusion view browser":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+alt+b"])
-                        # Command: Show/hide browser
-                    if vc['text'] == "fusion view activity":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+alt+a"])
-                        # Command: Show/hide activity
-                    if vc['text'] == "fusion view terminal":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+alt+c"])
-                        # Command: Show/hide text commands (Terminal)
-                    if vc['text'] == "fusion view toolbar":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+shift+w"])
-                        # Command: Show/hide toolbar
-                    if vc['text'] == "fusion view navigation bar":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+alt+n"])
-                        # Command: Show/hide navigation bar
-                    if vc['text'] == "fusion view data panel":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+alt+p"])
-                        # Command: Show/hide data panel
-                    if vc['text'] == "fusion view reset":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+alt+r"])
-                        # Command: Reset to default layout
-                    if vc['text'] == "fusion toolbox":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "s"])
-                        # Command: Toolbox (Current workspace) | For examble: Design Workspace, Sketch Environment, ...
-                    
-                    # --------------------------------------------------------------------------------------------------------------------------
-                    
-                    # Cube Keyboard Shortcuts:
-                    
-                    if vc['text'] == "fusion cube home":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/cube_view_home.sh"])
-                        # Command: Switch the view of your model - Home
-                    if vc['text'] == "fusion cube left":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/cube_view_left.sh"])
-                        # Command: Switch the view of your model - Left
-                    if vc['text'] == "fusion cube right":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/cube_view_right.sh"])
-                        # Command: Switch the view of your model - Right
-                    if vc['text'] == "fusion cube top":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/cube_view_top.sh"])
-                        # Command: Switch the view of your model - Top
-                    
-                    # --------------------------------------------------------------------------------------------------------------------------
-                                        
-                    # Design Workspace Shortcuts:
-                    
-                    if vc['text'] == "fusion appearance":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "a"])
-                        # Command: Appearance
-                    if vc['text'] == "fusion as built joint":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "shift+j"])
-                        # Command: As-built Joint
-                    if vc['text'] == "fusion compute all":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+b"])
-                        # Command: Compute All
-                    if vc['text'] == "fusion delete":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "Delete"])
-                        # Command: Delete
-                    if vc['text'] == "fusion extrude":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "e"])
-                        # Command: Extrude                   
-                    if vc['text'] == "fusion freeform selection":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "2"])
-                        # Command: Freeform Selection
-                    if vc['text'] == "fusion hole":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "h"])
-                        # Command: Hole
-                    if vc['text'] == "fusion joint":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "j"])
-                        # Command: Joint
-                    if vc['text'] == "fusion measure":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "i"])
-                        # Command: Measure
-                    if vc['text'] == "fusion model fillet":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "f"])
-                        # Command: Model Fillet
-                    if vc['text'] == "fusion move":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "m"])
-                        # Command: Move
-                    if vc['text'] == "fusion paint selection":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "3"])
-                        # Command: Paint Selection
-                    if vc['text'] == "fusion press pull":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "q"])
-                        # Command: Press Pull
-                    if vc['text'] == "fusion scripts and add ins":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "shift+s"])
-                        # Command: Scripts and Add-ins
-                    if vc['text'] == "fusion toggle component color cycling":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "shift+n"])
-                        # Command: Toggle Component Color Cycling
-                    if vc['text'] == "fusion toggle visibility":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "v"])
-                        # Command: Toggle Visibility
-                    if vc['text'] == "fusion window selection":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "1"])
-                        # Command: Window Selection
-                    
-                    # --------------------------------------------------------------------------------------------------------------------------
-                    
-                    # Sketch Environment Shortcuts:
-                    
-                    if vc['text'] == "fusion two point rectangle":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "r"])
-                        # Command: 2-point Rectangle
-                    if vc['text'] == "fusion center diameter circle":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "c"])
-                        # Command: Center Diameter Circle
-                    if vc['text'] == "fusion line":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "l"])
-                        # KeCommand: Line
-                    if vc['text'] == "fusion normal construction":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "x"])
-                        # Command: Normal / Construction
-                    if vc['text'] == "fusion offset":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "o"])
-                        # Command: Offset
-                    if vc['text'] == "fusion project":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "p"])
-                        # Command: Project (New Sketch)
-                    if vc['text'] == "fusion sketch dimension":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "d"])
-                        # Command: Sketch Dimension
-                    if vc['text'] == "fusion trim":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "t"])
-                        # Command: Trim
-                    
-                    # --------------------------------------------------------------------------------------------------------------------------
-                    
-                    # Canvas Selection Shortcuts:
-                    
-                    if vc['text'] == "fusion copy":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+c"])
-                        # Command: Copy
-                    if vc['text'] == "fusion cut":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+x"])
-                        # Command: Cut             
-                    if vc['text'] == "fusion paste":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+v"])
-                        # Command: Paste
-                    if vc['text'] == "fusion redo":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+y"])
-                        # Command: Redo
-                    if vc['text'] == "fusion undo":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "ctrl+z"])
-                        # Command: Undo
-                    
-                    # --------------------------------------------------------------------------------------------------------------------------
-                    
-                    # Direct Mesh Editing Shortcuts:
-                    
-                    if vc['text'] == "fusion expand to face group":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "alt+g"])
-                        # Command: Expand To Face Group
-                    if vc['text'] == "fusion expand to connected":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "alt+c"])
-                        # Command: Expand To Connected             
-                    if vc['text'] == "fusion grow selection":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "shift+up"])
-                        # Command: Grow Selection
-                    if vc['text'] == "fusion shrink selection":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "shift+down"])
-                        # Command: Shrink Selection
-                    if vc['text'] == "fusion invert":
-                        subprocess.run(["/home/steve/.config/fusion-360/scripts/speechtoolkit/keypress.sh", "alt+n"])
-                        # Command: Invert
-                    
-                    # --------------------------------------------------------------------------------------------------------------------------                   
-                    
-					# Still in Progress!
-					
+    # Here you get more informations about the shortcut configuration in Autodesk Fusion 360:
+    # - https://help.autodesk.com/view/fusion360/ENU/?guid=GUID-F0491540-0324-470A-B651-2238D0EFAC30
+    # - https://help.autodesk.com/view/fusion360/ENU/?guid=GUID-E8541F92-A2DA-4CBF-A708-5374679B3F35
+    # The shortcuts are configured in commands.json (and your own files via --commands).
 
-                    
- 
-                else:
-                    print(rec.PartialResult())
-                if dump_fn is not None:
-                    dump_fn.write(data)
+    import sounddevice as sd
+    with sd.RawInputStream(samplerate=args.samplerate, blocksize = args.blocksize, device=args.device, dtype='int16', channels=1, callback=callback):
+            print('#' * 80)
+            print('Press Ctrl+C to stop the recording')
+            print('#' * 80)
+
+            executor.start()
+            worker.start()
+            if args.preload:
+                threading.Thread(target=preload, args=(models, args.preload), name='f360-preload', daemon=True).start()
+            while worker.is_alive():
+                worker.join(0.5)
+            if worker.error is not None:
+                raise worker.error
 
 except KeyboardInterrupt:
-    print('\nDone')
-    parser.exit(0)
+    pass
 except Exception as e:
-    parser.exit(type(e).__name__ + ': ' + str(e))
+    error = type(e).__name__ + ': ' + str(e)
+finally:
+    # Also after an error: close the recordings (the WAV header is written last), the sockets
+    # and the statistics.
+    if worker is not None and worker.is_alive():
+        worker.stop()
+        worker.join(1.0)
+    if worker is not None and executor.is_alive():
+        executor.stop()
+        executor.join(1.0)
+    if recorder is not None:
+        recorder.close()
+    if backend is not None:
+        backend.close()
+    if rec is not None:
+        print('Commands: %(early)d early, %(final)d final, %(suppressed)d finals suppressed' % rec.counters)
+    if worker is not None:
+        print('Actions: %(run)d run, %(stale)d stale, %(failed)d failed, %(dropped)d dropped' % executor.counters)
+        print('Audio overruns: %d' % capture.overruns)
+        if recorder is not None:
+            print('Recordings: %(segments)d written, %(discarded)d discarded, %(dropped)d blocks dropped' %
+                  recorder.counters)
+        if worker.gate is not None:
+            print('VAD: %.1f%% of %d blocks skipped' % (100 * worker.gate.skipped_fraction, worker.gate.blocks))
+    if stats_server is not None:
+        stats_server.close()
+    if control_server is not None:
+        control_server.close()
+    if stats is not None and args.stats_file:
+        stats.dump(args.stats_file)
+        print('Statistics written to ' + args.stats_file)
+
+if error is not None:
+    parser.exit(error)
+print('\nDone')
+parser.exit(0)
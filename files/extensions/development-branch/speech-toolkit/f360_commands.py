@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Command Table (Linux & Windows)              #
+# Description:  Loads the voice commands from JSON files and finds the command for a phrase.       #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:40/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# A command file looks like this:
+#
+#   {
+#       "commands": [
+#           {"phrase": "fusion extrude", "key": "e", "workspace": "design", "description": "Extrude"},
+#           {"phrase": "fusion four view ports", "aliases": ["fusion for view ports"], "key": "shift+1"},
+#           {"phrase": "fusion cube home", "target": "cube home", "workspace": "cube"}
+#       ]
+#   }
+#
+# Every command needs a "phrase" and one action ("key", "click", "target" or "switch"). "click" is
+# an absolute screen position, "target" a named point of the Fusion 360 window (see f360_macros,
+# it follows the window when it is moved or resized). "aliases" (homophones,
+# other wordings), "workspace" and "description" are optional. If several files define the same
+# phrase, the last file wins - so you can override the default commands with your own file.
+#
+# "switch" doesn't send anything to Fusion 360, it tells the toolkit which workspace you are in
+# ("all" for every workspace). In grammar mode the recognizer only listens for the commands of the
+# current workspace - the commands of the workspaces in SCOPED_WORKSPACES are only active there,
+# all other commands are active everywhere.
+#
+# Several commands can be spoken at once: "fusion cube top then extrude" runs "fusion cube top" and
+# "fusion extrude" as one macro. After the first command the leading "fusion" can be left out
+# (not in grammar mode, there the recognizer only knows the whole phrases).
+#
+# The phrases in commands.json are English (en-US). The other languages translate them in
+# locale/<locale>.json, the actions stay the same:
+#
+#   {"locale": "de-DE", "separator": "dann", "phrases": {"fusion extrude": "fusion extrudieren",
+#                                   "fusion center diameter circle": ["fusion kreis mittelpunkt durchmesser", "fusion kreis"]}}
+#
+# A list is the phrase followed by its aliases. Commands without a translation keep their phrase.
+
+import json
+import os
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_COMMANDS = os.path.join(SCRIPT_DIR, "commands.json")
+LOCALE_DIR = os.path.join(SCRIPT_DIR, "locale")
+DEFAULT_LOCALE = "en-US"
+
+ACTIONS = ("key", "click", "target", "switch")
+BACKEND_ACTIONS = ("key", "click", "target")
+MACRO = "macro"
+SEPARATOR = "then"
+SCOPED_WORKSPACES = ("design", "sketch", "mesh")
+ALL_WORKSPACES = "all"
+
+
+class CommandError(Exception):
+    """Raised when a command file can't be loaded."""
+
+
+def normalize(text):
+    """Bring a phrase into the form that is used as the lookup key."""
+    return " ".join(text.lower().split())
+
+
+def locales():
+    """All locales with a command table."""
+    names = [DEFAULT_LOCALE]
+    if os.path.isdir(LOCALE_DIR):
+        names.extend(os.path.splitext(name)[0] for name in os.listdir(LOCALE_DIR) if name.endswith(".json"))
+    return sorted(set(names))
+
+
+class Command(object):
+    """One voice command: a phrase, its aliases and the action that is run."""
+
+    __slots__ = ("phrase", "aliases", "action", "args", "workspace", "description")
+
+    def __init__(self, phrase, action, args, aliases=(), workspace=None, description=None):
+        self.phrase = phrase
+        self.action = action
+        self.args = args
+        self.aliases = tuple(aliases)
+        self.workspace = workspace
+        self.description = description
+
+    @classmethod
+    def from_dict(cls, entry):
+        try:
+            phrase = normalize(entry["phrase"])
+        except (KeyError, TypeError, AttributeError):
+            raise CommandError("Command without a phrase: %r" % (entry,))
+        actions = [action for action in ACTIONS if action in entry]
+        if len(actions) != 1:
+            raise CommandError("Command '%s' needs exactly one of: %s" % (phrase, ", ".join(ACTIONS)))
+        action = actions[0]
+        value = entry[action]
+        if action in ("key", "target", "switch"):
+            if not isinstance(value, str) or not value.strip():
+                raise CommandError("Command '%s': %s must be a non-empty string" % (phrase, action))
+            args = (value,)
+        else:
+            if not isinstance(value, list) or len(value) not in (2, 3) \
+                    or not all(type(number) is int for number in value):
+                raise CommandError("Command '%s': click must be [x, y] or [x, y, button]" % phrase)
+            args = tuple(value)
+        aliases = entry.get("aliases", [])
+        if not isinstance(aliases, list) or not all(isinstance(alias, str) and normalize(alias)
+                                                    for alias in aliases):
+            raise CommandError("Command '%s': aliases must be a list of phrases" % phrase)
+        return cls(phrase, action, args,
+                   aliases=[normalize(alias) for alias in aliases],
+                   workspace=entry.get("workspace"),
+                   description=entry.get("description"))
+
+    @classmethod
+    def macro(cls, phrase, commands):
+        """A command that runs several commands (its args) in one go."""
+        return cls(phrase, MACRO, tuple(commands))
+
+    def steps(self):
+        """The (action, args) steps of this command - several for a macro."""
+        if self.action == MACRO:
+            return [(command.action, command.args) for command in self.args]
+        return [(self.action, self.args)]
+
+    def run(self, backend):
+        """Send the action of this command through an injection backend."""
+        if self.action == MACRO:
+            backend.batch(self.steps())
+        elif self.action in BACKEND_ACTIONS:
+            getattr(backend, self.action)(*self.args)
+
+    def __repr__(self):
+        return "Command(%r, %s%r)" % (self.phrase, self.action, self.args)
+
+
+class CommandTable(object):
+    """All known commands, compiled into one hash index over phrases and aliases."""
+
+    def __init__(self, commands=()):
+        self.commands = {}
+        self.aliases = {}
+        self.index = {}
+        self.separator = SEPARATOR
+        for command in commands:
+            self.add(command)
+
+    @classmethod
+    def load(cls, *paths):
+        """Load one or more command files. Later files override earlier ones."""
+        table = cls()
+        for path in paths:
+            table.load_file(path)
+        return table
+
+    @classmethod
+    def for_locale(cls, locale, *paths):
+        """The default commands in the language of a locale, followed by the command files."""
+        table = cls.load(DEFAULT_COMMANDS)
+        if locale != DEFAULT_LOCALE:
+            path = os.path.join(LOCALE_DIR, locale + ".json")
+            if not os.path.exists(path):
+                raise CommandError("No command table for the locale %s (choose from: %s)" % (
+                    locale, ", ".join(locales())))
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                phrases = data["phrases"]
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                raise CommandError("Can't read the locale file %s: %s" % (path, e))
+            table = table.translate(phrases)
+            table.separator = normalize(data.get("separator", SEPARATOR))
+        for path in paths:
+            table.load_file(path)
+        return table
+
+    def translate(self, phrases):
+        """A copy of the table with other phrases: {old phrase: new phrase or [phrase, alias, ...]}."""
+        table = CommandTable()
+        for command in self.commands.values():
+            translation = phrases.get(command.phrase)
+            if translation is None:
+                table.add(command)
+                continue
+            if isinstance(translation, str):
+                translation = [translation]
+            table.add(Command(normalize(translation[0]), command.action, command.args,
+                              aliases=[normalize(alias) for alias in translation[1:]],
+                              workspace=command.workspace, description=command.description))
+        return table
+
+    def load_file(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError("Can't read the command file %s: %s" % (path, e))
+        entries = data.get("commands", []) if isinstance(data, dict) else data
+        for entry in entries:
+            self.add(Command.from_dict(entry))
+
+    def add(self, command):
+        old = self.commands.get(command.phrase)
+        if old is not None:
+            self.remove(old)
+        self.commands[command.phrase] = command
+        self.index[command.phrase] = command
+        for alias in command.aliases:
+            self.aliases[alias] = command.phrase
+            self.index[alias] = command
+
+    def remove(self, command):
+        del self.commands[command.phrase]
+        for phrase in (command.phrase,) + command.aliases:
+            if self.index.get(phrase) is command:
+                del self.index[phrase]
+            self.aliases.pop(phrase, None)
+
+    def lookup(self, text):
+        """Return the command for a recognized text, or None."""
+        command = self.index.get(text)
+        if command is None:
+            text = normalize(text)
+            command = self.index.get(text)
+            if command is None and self.separator in text.split():
+                command = self._macro(text)
+        return command
+
+    def _macro(self, text):
+        """The macro for "<phrase> then <phrase> ...", or None if a part isn't a command."""
+        parts = text.split(" %s " % self.separator)
+        prefix = parts[0].split()[0]
+        commands = []
+        for part in parts:
+            command = self.index.get(part) or self.index.get(prefix + " " + part)
+            if command is None or command.action not in BACKEND_ACTIONS:
+                return None
+            commands.append(command)
+        return Command.macro(text, commands)
+
+    def workspaces(self):
+        return sorted(set(command.workspace for command in self.commands.values() if command.workspace))
+
+    def vocabulary(self, workspace=None):
+        """All phrases (with aliases) that can be spoken in a workspace, or everywhere for None."""
+        if workspace == ALL_WORKSPACES:
+            workspace = None
+        phrases = []
+        for command in self.commands.values():
+            if workspace is None or command.workspace not in SCOPED_WORKSPACES or command.workspace == workspace:
+                phrases.append(command.phrase)
+                phrases.extend(command.aliases)
+        return sorted(phrases)
+
+    def grammar(self, workspace=None):
+        """The Vosk grammar (JSON list) for a workspace, with "[unk]" for everything else.
+
+        The separator is in it too, so macros of several phrases can be recognized.
+        """
+        return json.dumps(self.vocabulary(workspace) + [self.separator, "[unk]"])
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __contains__(self, text):
+        return self.lookup(text) is not None
+
+
+class PrefixMatcher(object):
+    """Word trie over all phrases and aliases, to find the command of a partial result early."""
+
+    __slots__ = ("root",)
+
+    def __init__(self, table):
+        self.root = _TrieNode()
+        for phrase, command in table.index.items():
+            words = phrase.split()
+            node = self.root
+            node.add(command, len(words))
+            for word in words:
+                node = node.children.setdefault(word, _TrieNode())
+                node.add(command, len(words))
+
+    def match(self, text):
+        """Return (command, coverage) if the words of text lead to exactly one command, else None.
+
+        coverage is the part of the (shortest) phrase of the command that was already heard, so
+        1.0 means the whole phrase was spoken.
+        """
+        words = text.split()
+        node = self.root
+        for word in words:
+            node = node.children.get(word)
+            if node is None:
+                return None
+        if len(node.commands) != 1:
+            return None
+        for command, length in node.commands.items():
+            return command, len(words) / float(length)
+
+
+class _TrieNode(object):
+
+    __slots__ = ("children", "commands")
+
+    def __init__(self):
+        self.children = {}
+        # Every command below this node, with the word count of its shortest phrase:
+        self.commands = {}
+
+    def add(self, command, length):
+        if length < self.commands.get(command, length + 1):
+            self.commands[command] = length
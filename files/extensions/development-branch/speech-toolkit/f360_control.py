@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Control Socket (Linux & Windows)             #
+# Description:  Controls a running speech toolkit (--daemon) over a Unix socket.                   #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:54/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# With --daemon the toolkit keeps the model and the audio stream open and listens on a Unix socket.
+# The protocol is one JSON object per line in both directions:
+#
+#   -> {"command": "workspace", "args": ["sketch"]}
+#   <- {"ok": true, "result": "sketch"}
+#
+# Commands:
+#
+#   status               state, model, workspace, commands and counters
+#   pause / resume       stop / start listening (the audio stream stays open)
+#   workspace NAME       switch the workspace of the grammar mode (design, sketch, mesh, all)
+#   commands [FILE ...]  switch to another command set: the default commands plus FILE ...
+#   reload               read the command files of the current set again
+#   language LOCALE      switch the language: its model (cached, see f360_models) and phrases
+#   stop                 shut the daemon down
+#
+# The client side only needs this module, so it starts instantly:
+#
+#   python3 f360-speechtoolkit.py --control status
+#   python3 f360-speechtoolkit.py --control commands my-commands.json
+
+import concurrent.futures
+import inspect
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import _thread
+
+import f360_commands
+import f360_models
+import f360_stats
+
+
+COMMANDS = ("status", "pause", "resume", "workspace", "commands", "reload", "language", "stop")
+
+
+class ControlError(Exception):
+    """Raised when a control command fails or the daemon can't be reached."""
+
+
+class Controller(object):
+    """The control commands for a running RecognitionWorker."""
+
+    def __init__(self, worker, command_files=(), info=None, models=None, locale=f360_commands.DEFAULT_LOCALE):
+        self.worker = worker
+        self.command_files = list(command_files)
+        self.models = models
+        self.locale = locale
+        self.info = dict(info or {})
+        self.started = time.time()
+
+    def handle(self, request):
+        """Run one request dict and return the response dict."""
+        name = request.get("command")
+        if name not in COMMANDS:
+            return {"ok": False, "error": "Unknown command: %s (choose from: %s)" % (name, ", ".join(COMMANDS))}
+        method = getattr(self, name)
+        args = request.get("args", [])
+        if not isinstance(args, list):
+            return {"ok": False, "error": "%s: args must be a list" % name}
+        try:
+            inspect.signature(method).bind(*args)
+        except TypeError as e:
+            return {"ok": False, "error": "%s: %s" % (name, e)}
+        try:
+            return {"ok": True, "result": method(*args)}
+        except (ControlError, f360_commands.CommandError) as e:
+            return {"ok": False, "error": str(e)}
+        except concurrent.futures.TimeoutError:
+            return {"ok": False, "error": "%s: the recognizer didn't answer in time" % name}
+        except Exception as e:
+            # E.g. Vosk failing in set_model - the client gets the error, the daemon keeps running:
+            return {"ok": False, "error": "%s: %s" % (type(e).__name__, e)}
+
+    def status(self):
+        worker = self.worker
+        rec = worker.recognizer
+        result = dict(self.info)
+        result.update({
+            "state": "paused" if worker.paused else "listening",
+            "uptime": time.time() - self.started,
+            "locale": self.locale,
+            "locales": f360_commands.locales(),
+            "workspace": rec.workspace or f360_commands.ALL_WORKSPACES,
+            "workspaces": rec.commands.workspaces(),
+            "commands": len(rec.commands),
+            "command_files": self.command_files,
+            "recognizer": dict(rec.counters),
+            "actions": dict(worker.executor.counters),
+        })
+        if worker.capture is not None:
+            result["audio"] = {"overruns": worker.capture.overruns, "queued": len(worker.capture)}
+        if worker.gate is not None:
+            result["vad"] = {"blocks": worker.gate.blocks, "skipped": worker.gate.skipped}
+        if worker.recorder is not None:
+            result["recorder"] = dict(worker.recorder.counters)
+        if self.models is not None:
+            result["models"] = dict(self.models.counters, cached=dict(self.models.loaded()))
+        return result
+
+    def pause(self):
+        self.worker.pause()
+        return "paused"
+
+    def resume(self):
+        self.worker.resume()
+        return "listening"
+
+    def workspace(self, name):
+        rec = self.worker.recognizer
+        if name != f360_commands.ALL_WORKSPACES and name not in rec.commands.workspaces():
+            raise ControlError("Unknown workspace: %s" % name)
+        self.worker.call(rec.set_workspace, name)
+        return name
+
+    def commands(self, *files):
+        # Read the files here, the recognizer only has to swap the table:
+        table = f360_commands.CommandTable.for_locale(self.locale, *files)
+        self.worker.call(self.worker.recognizer.reload, table)
+        self.command_files = list(files)
+        return len(table)
+
+    def reload(self):
+        return self.commands(*self.command_files)
+
+    def language(self, locale):
+        if self.models is None:
+            raise ControlError("This speech toolkit has only one model")
+        table = f360_commands.CommandTable.for_locale(locale, *self.command_files)
+        try:
+            # Loading a model that isn't cached takes a while, but not on the recognition thread:
+            model = self.models.get(locale)
+        except f360_models.ModelError as e:
+            raise ControlError(str(e))
+        self.worker.call(self.worker.recognizer.set_model, model, table)
+        self.models.activate(locale)
+        self.locale = locale
+        return locale
+
+    def stop(self):
+        # The main thread cleans up as if Ctrl+C was pressed:
+        _thread.interrupt_main()
+        return "stopping"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line.decode("utf-8"))
+                if not isinstance(request, dict):
+                    raise ValueError("not an object")
+            except ValueError as e:
+                response = {"ok": False, "error": "Invalid request: %s" % e}
+            else:
+                response = self.server.controller.handle(request)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves a Controller on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, controller, path):
+        # A second --daemon must not steal the socket of the first one:
+        f360_stats.claim_socket(path)
+        socketserver.UnixStreamServer.__init__(self, path, _Handler)
+        os.chmod(path, 0o600)
+        self.controller = controller
+        self.path = path
+        self._thread = threading.Thread(target=self.serve_forever, name="f360-control", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def request(path, command, *args, timeout=10.0):
+    """Send one command to the daemon and return its result."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(path)
+        except OSError:
+            raise ControlError("No speech toolkit is running on %s (start it with --daemon)" % path)
+        with sock.makefile("rwb") as f:
+            f.write(json.dumps({"command": command, "args": list(args)}).encode("utf-8") + b"\n")
+            f.flush()
+            line = f.readline()
+    except OSError as e:
+        raise ControlError("Lost the connection to %s: %s" % (path, e))
+    finally:
+        sock.close()
+    if not line:
+        raise ControlError("The speech toolkit closed the connection")
+    response = json.loads(line.decode("utf-8"))
+    if not response.get("ok"):
+        raise ControlError(response.get("error", "failed"))
+    return response.get("result")
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Key Injection (Linux & Windows)              #
+# Description:  Backends that send key chords and mouse clicks to Autodesk Fusion 360.             #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:39/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# Available backends:
+# - xtest:   Keeps one X connection open and sends the events in-process (needs python-xlib).
+# - xdotool: Runs one xdotool process per action (no bash, no extra getactivewindow call).
+# - shell:   The old way - runs keypress.sh and the cube_view_*.sh scripts (fallback).
+# - record:  Dry run - only records the actions with a timestamp (for benchmarks under Xvfb).
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The cube_view_*.sh scripts click these screen coordinates (where the ViewCube targets of
+# f360_macros end up in a maximized window on a 1920x1080 screen):
+CUBE_SCRIPTS = {
+    (1812, 181): "cube_view_home.sh",
+    (1825, 230): "cube_view_left.sh",
+    (1888, 228): "cube_view_right.sh",
+    (1858, 209): "cube_view_top.sh",
+}
+
+# xdotool accepts these modifier names in a key chord:
+MODIFIERS = {
+    "ctrl": "Control_L",
+    "control": "Control_L",
+    "shift": "Shift_L",
+    "alt": "Alt_L",
+    "super": "Super_L",
+    "meta": "Meta_L",
+}
+
+
+class InjectionError(Exception):
+    """Raised when a backend can't be used or an action fails."""
+
+
+class Backend(object):
+    """Base class for all injection backends."""
+
+    name = None
+    # Seconds an external xdotool/script call may take, None = no limit:
+    timeout = None
+
+    def key(self, chord):
+        """Press and release a key chord like 'ctrl+shift+s'."""
+        raise NotImplementedError
+
+    def click(self, x, y, button=1):
+        """Move the mouse to x, y and click a mouse button."""
+        raise NotImplementedError
+
+    def target(self, name, button=1):
+        """Click a named point of the Fusion 360 window (resolved by f360_macros.MacroBackend)."""
+        raise InjectionError("Can't click '%s': the position of the Fusion 360 window is unknown "
+                             "(needs python-xlib or xdotool)" % name)
+
+    def batch(self, steps):
+        """Run several (action, args) steps in one go, e.g. [("target", ("cube top",)), ("key", ("e",))]."""
+        for action, args in steps:
+            getattr(self, action)(*args)
+
+    def close(self):
+        """Release all resources of the backend."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class XTestBackend(Backend):
+    """Sends the events through the XTEST extension over one persistent X connection."""
+
+    name = "xtest"
+
+    def __init__(self, display=None):
+        try:
+            from Xlib import X, XK, display as xdisplay
+            from Xlib.ext import xtest
+        except ImportError:
+            raise InjectionError("The xtest backend needs python-xlib (pip install python-xlib)")
+        self._X = X
+        self._XK = XK
+        self._xtest = xtest
+        try:
+            self._display = xdisplay.Display(display)
+        except Exception as e:
+            raise InjectionError("Can't open the X display: %s" % e)
+        if not self._display.has_extension("XTEST"):
+            self._display.close()
+            raise InjectionError("The X server doesn't support the XTEST extension")
+        # Keycodes only change with the keyboard mapping, so each chord is resolved only once:
+        self._chords = {}
+
+    def _keysym(self, name):
+        XK = self._XK
+        name = MODIFIERS.get(name.lower(), name)
+        for candidate in (name, name.capitalize(), name.upper(), name.lower()):
+            keysym = XK.string_to_keysym(candidate)
+            if keysym:
+                return keysym
+        raise InjectionError("Unknown key: %s" % name)
+
+    def _keycodes(self, chord):
+        keycodes = self._chords.get(chord)
+        if keycodes is None:
+            keycodes = []
+            for name in chord.split("+"):
+                keycode = self._display.keysym_to_keycode(self._keysym(name))
+                if not keycode:
+                    raise InjectionError("No keycode for key: %s" % name)
+                keycodes.append(keycode)
+            keycodes = self._chords[chord] = tuple(keycodes)
+        return keycodes
+
+    def _key(self, chord):
+        X = self._X
+        fake_input = self._xtest.fake_input
+        keycodes = self._keycodes(chord)
+        for keycode in keycodes:
+            fake_input(self._display, X.KeyPress, keycode)
+        for keycode in reversed(keycodes):
+            fake_input(self._display, X.KeyRelease, keycode)
+
+    def _click(self, x, y, button=1):
+        X = self._X
+        fake_input = self._xtest.fake_input
+        fake_input(self._display, X.MotionNotify, x=x, y=y)
+        fake_input(self._display, X.ButtonPress, button)
+        fake_input(self._display, X.ButtonRelease, button)
+
+    def key(self, chord):
+        self._key(chord)
+        self._display.sync()
+
+    def click(self, x, y, button=1):
+        self._click(x, y, button)
+        self._display.sync()
+
+    def batch(self, steps):
+        # All events of a macro go out in one round trip:
+        for action, args in steps:
+            if action == "key":
+                self._key(*args)
+            elif action == "click":
+                self._click(*args)
+            else:
+                self.target(*args)
+        self._display.sync()
+
+    def close(self):
+        self._display.close()
+
+
+class XdotoolBackend(Backend):
+    """Runs xdotool directly, one process per action instead of bash and three xdotool calls."""
+
+    name = "xdotool"
+
+    def __init__(self, xdotool="xdotool"):
+        self._xdotool = shutil.which(xdotool)
+        if self._xdotool is None:
+            raise InjectionError("The xdotool backend needs xdotool in the PATH")
+
+    def key(self, chord):
+        subprocess.run([self._xdotool, "key", chord], check=True, timeout=self.timeout)
+
+    def click(self, x, y, button=1):
+        subprocess.run([self._xdotool, "mousemove", str(x), str(y), "click", str(button)],
+                       check=True, timeout=self.timeout)
+
+    def batch(self, steps):
+        # xdotool chains commands, so a whole macro is one process:
+        command = [self._xdotool]
+        for action, args in steps:
+            if action == "key":
+                command += ["key", args[0]]
+            elif action == "click":
+                button = args[2] if len(args) > 2 else 1
+                command += ["mousemove", str(args[0]), str(args[1]), "click", str(button)]
+            else:
+                self.target(*args)
+        subprocess.run(command, check=True, timeout=self.timeout)
+
+
+class ShellBackend(Backend):
+    """Runs the old keypress.sh and cube_view_*.sh helper scripts."""
+
+    name = "shell"
+
+    def __init__(self, scripts_dir=None):
+        self._scripts_dir = scripts_dir or SCRIPT_DIR
+
+    def _script(self, name):
+        return os.path.join(self._scripts_dir, name)
+
+    def key(self, chord):
+        subprocess.run(["bash", self._script("keypress.sh"), chord], timeout=self.timeout)
+
+    def click(self, x, y, button=1):
+        script = CUBE_SCRIPTS.get((x, y))
+        if script is not None and button == 1:
+            subprocess.run(["bash", self._script(script)], timeout=self.timeout)
+        else:
+            subprocess.run(["bash", "-c", 'xdotool getactivewindow && xdotool mousemove "$0" "$1" click "$2"',
+                            str(x), str(y), str(button)], timeout=self.timeout)
+
+
+class RecordingBackend(Backend):
+    """Records every action with a monotonic timestamp and optionally passes it on to another backend."""
+
+    name = "record"
+
+    def __init__(self, inner=None, verbose=False):
+        self.inner = inner
+        self.verbose = verbose
+        self.events = []
+
+    @property
+    def timeout(self):
+        return self.inner.timeout if self.inner is not None else None
+
+    @timeout.setter
+    def timeout(self, value):
+        if self.inner is not None:
+            self.inner.timeout = value
+
+    def _record(self, action, args, send):
+        start = time.monotonic()
+        if self.inner is not None:
+            send(*args)
+        end = time.monotonic()
+        self.events.append((start, end - start, action, args))
+        if self.verbose:
+            print("[%s] %s %s" % (self.name, action, " ".join(str(a) for a in args)), file=sys.stderr)
+
+    def key(self, chord):
+        self._record("key", (chord,), self.inner and self.inner.key)
+
+    def click(self, x, y, button=1):
+        self._record("click", (x, y, button), self.inner and self.inner.click)
+
+    def target(self, name, button=1):
+        self._record("target", (name, button), self.inner and self.inner.target)
+
+    def batch(self, steps):
+        start = time.monotonic()
+        if self.inner is not None:
+            self.inner.batch(steps)
+        end = time.monotonic()
+        for action, args in steps:
+            self.events.append((start, end - start, action, tuple(args)))
+            if self.verbose:
+                print("[%s] %s %s" % (self.name, action, " ".join(str(a) for a in args)), file=sys.stderr)
+
+    def clear(self):
+        del self.events[:]
+
+    def close(self):
+        if self.inner is not None:
+            self.inner.close()
+
+
+BACKENDS = {
+    "xtest": XTestBackend,
+    "xdotool": XdotoolBackend,
+    "shell": ShellBackend,
+    "record": RecordingBackend,
+}
+
+
+def get_backend(name="auto", **kwargs):
+    """Create an injection backend by name. 'auto' picks the fastest one that works here."""
+    if name != "auto":
+        try:
+            cls = BACKENDS[name]
+        except KeyError:
+            raise InjectionError("Unknown backend: %s (choose from: auto, %s)" % (name, ", ".join(BACKENDS)))
+        return cls(**kwargs)
+    if os.environ.get("DISPLAY"):
+        try:
+            return XTestBackend()
+        except InjectionError:
+            pass
+    try:
+        return XdotoolBackend()
+    except InjectionError:
+        return ShellBackend(**kwargs)
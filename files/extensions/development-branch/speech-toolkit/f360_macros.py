@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Targets & Macros (Linux & Windows)           #
+# Description:  Clicks the ViewCube and other targets relative to the Fusion 360 window.           #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:58/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# A target is a point of the Fusion 360 window, given as offset from one of its corners: the
+# ViewCube sits in the top right corner of the canvas, so "cube top" is ("top-right", -62, 209).
+# The click follows the window when it is moved or resized, on every resolution.
+#
+# The window geometry is looked up once and cached. With python-xlib the tracker listens for the
+# ConfigureNotify events of the window and only looks again after a move or a resize. Without it,
+# xdotool is asked once per action instead. If the window manager can't list the windows, the
+# active window is used, but looked up again for every action.
+#
+# The offsets of the targets differ with the theme and the display scaling, so they can be learned
+# once per screen size and are saved in ~/.config/f360-speechtoolkit/targets.json:
+#
+#   python3 f360-speechtoolkit.py --calibrate "cube home" "cube top"
+#
+# Move the mouse over each target and press Enter. Your own targets can be learned the same way and
+# used in a command file: {"phrase": "fusion toolbar create", "target": "toolbar create"}
+
+import json
+import os
+import shutil
+import subprocess
+
+import f360_inject
+
+
+# Measured on a maximized window on a 1920x1080 screen (the coordinates of the cube_view_*.sh scripts):
+DEFAULT_TARGETS = {
+    "cube home": ("top-right", -108, 181),
+    "cube left": ("top-right", -95, 230),
+    "cube right": ("top-right", -32, 228),
+    "cube top": ("top-right", -62, 209),
+}
+
+
+def default_targets_file():
+    config = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(config, "f360-speechtoolkit", "targets.json")
+
+
+class Targets(object):
+    """The targets with their anchor and offset, learned ones per screen size ("1920x1080")."""
+
+    def __init__(self, path=None):
+        self.path = path or default_targets_file()
+        self.learned = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.learned = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            raise f360_inject.InjectionError("Can't read the targets file %s: %s" % (self.path, e))
+
+    def names(self, layout=None):
+        return sorted(set(DEFAULT_TARGETS) | set(self.learned.get(layout, {})))
+
+    def get(self, name, layout):
+        """(anchor, dx, dy) of a target."""
+        target = self.learned.get(layout, {}).get(name) or DEFAULT_TARGETS.get(name)
+        if target is None:
+            raise f360_inject.InjectionError("Unknown target: %s (calibrate it with --calibrate)" % name)
+        return tuple(target)
+
+    def learn(self, name, layout, geometry, x, y):
+        """Remember the screen position x, y as target, relative to the nearest window corner."""
+        wx, wy, width, height = geometry
+        vertical = "bottom" if y - wy > height / 2 else "top"
+        horizontal = "right" if x - wx > width / 2 else "left"
+        anchor = vertical + "-" + horizontal
+        dx = x - wx - (width if horizontal == "right" else 0)
+        dy = y - wy - (height if vertical == "bottom" else 0)
+        self.learned.setdefault(layout, {})[name] = [anchor, dx, dy]
+        return anchor, dx, dy
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.learned, f, indent=2, sort_keys=True)
+
+
+def resolve(target, geometry):
+    """Screen position of an (anchor, dx, dy) target in a window (x, y, width, height)."""
+    anchor, dx, dy = target
+    x, y, width, height = geometry
+    if anchor.endswith("right"):
+        x += width
+    if anchor.startswith("bottom"):
+        y += height
+    return x + dx, y + dy
+
+
+class XlibTracker(object):
+    """Geometry of the Fusion 360 window, cached until the window is moved, resized or closed."""
+
+    def __init__(self, title="Autodesk Fusion", display=None):
+        try:
+            from Xlib import X, display as xdisplay
+        except ImportError:
+            raise f360_inject.InjectionError("The window tracker needs python-xlib (pip install python-xlib)")
+        self._X = X
+        try:
+            self._display = xdisplay.Display(display)
+        except Exception as e:
+            raise f360_inject.InjectionError("Can't open the X display: %s" % e)
+        self.title = title
+        self._root = self._display.screen().root
+        self._client_list = self._display.intern_atom("_NET_CLIENT_LIST")
+        self._active = self._display.intern_atom("_NET_ACTIVE_WINDOW")
+        self._name = self._display.intern_atom("_NET_WM_NAME")
+        self._window = None
+        self._geometry = None
+        self.counters = {"lookups": 0, "hits": 0, "invalidated": 0}
+
+    def layout(self):
+        screen = self._display.screen()
+        return "%dx%d" % (screen.width_in_pixels, screen.height_in_pixels)
+
+    def _title(self, window):
+        try:
+            prop = window.get_full_property(self._name, 0)
+            name = prop.value if prop is not None else window.get_wm_name()
+        except Exception:
+            # The window is gone already:
+            return ""
+        if isinstance(name, bytes):
+            name = name.decode("utf-8", "replace")
+        return name or ""
+
+    def _find(self):
+        """(window, tracked): the window with the title, or the active window if the window manager
+        can't list them. Only a window found by its title is tracked (and cached)."""
+        prop = self._root.get_full_property(self._client_list, self._X.AnyPropertyType)
+        if prop is not None:
+            for window_id in prop.value:
+                window = self._display.create_resource_object("window", window_id)
+                if self.title in self._title(window):
+                    return window, True
+            raise f360_inject.InjectionError("Can't find the Fusion 360 window ('%s')" % self.title)
+        prop = self._root.get_full_property(self._active, self._X.AnyPropertyType)
+        if prop is None or not prop.value or not prop.value[0]:
+            raise f360_inject.InjectionError("Can't find the Fusion 360 window ('%s')" % self.title)
+        return self._display.create_resource_object("window", prop.value[0]), False
+
+    def _events(self):
+        X = self._X
+        while self._display.pending_events():
+            event = self._display.next_event()
+            if event.type == X.DestroyNotify:
+                self._window = None
+            if event.type in (X.ConfigureNotify, X.UnmapNotify, X.DestroyNotify) and self._geometry is not None:
+                self._geometry = None
+                self.counters["invalidated"] += 1
+
+    def geometry(self):
+        """(x, y, width, height) of the window on the screen."""
+        self._events()
+        if self._geometry is not None:
+            self.counters["hits"] += 1
+            return self._geometry
+        self.counters["lookups"] += 1
+        window = self._window
+        tracked = True
+        if window is None:
+            window, tracked = self._find()
+            if tracked:
+                window.change_attributes(event_mask=self._X.StructureNotifyMask)
+                self._window = window
+        try:
+            size = window.get_geometry()
+            origin = self._root.translate_coords(window, 0, 0)
+        except Exception as e:
+            self._window = None
+            raise f360_inject.InjectionError("Lost the Fusion 360 window: %s" % e)
+        geometry = (origin.x, origin.y, size.width, size.height)
+        if tracked:
+            # The active window of the fallback may be another one at the next action, so only the
+            # geometry of a tracked window is kept:
+            self._geometry = geometry
+        return geometry
+
+    def pointer(self):
+        pointer = self._root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def close(self):
+        self._display.close()
+
+
+class XdotoolTracker(object):
+    """Geometry of the Fusion 360 window from xdotool (no events, so it asks every time)."""
+
+    def __init__(self, title="Autodesk Fusion", xdotool="xdotool"):
+        self._xdotool = shutil.which(xdotool)
+        if self._xdotool is None:
+            raise f360_inject.InjectionError("The window tracker needs python-xlib or xdotool")
+        self.title = title
+        self.counters = {"lookups": 0, "hits": 0, "invalidated": 0}
+
+    def _shell(self, *args):
+        """Run xdotool with --shell output and return the variables."""
+        try:
+            output = subprocess.run([self._xdotool] + list(args), check=True, timeout=2.0,
+                                    stdout=subprocess.PIPE, universal_newlines=True).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            raise f360_inject.InjectionError("Can't find the Fusion 360 window ('%s'): %s" % (self.title, e))
+        return dict(line.split("=", 1) for line in output.splitlines() if "=" in line)
+
+    def layout(self):
+        try:
+            width, height = subprocess.run([self._xdotool, "getdisplaygeometry"], check=True, timeout=2.0,
+                                           stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
+            raise f360_inject.InjectionError("Can't get the screen size: %s" % e)
+        return "%sx%s" % (width, height)
+
+    def geometry(self):
+        self.counters["lookups"] += 1
+        values = self._shell("search", "--limit", "1", "--name", self.title, "getwindowgeometry", "--shell")
+        try:
+            return int(values["X"]), int(values["Y"]), int(values["WIDTH"]), int(values["HEIGHT"])
+        except (KeyError, ValueError):
+            raise f360_inject.InjectionError("Can't find the Fusion 360 window ('%s')" % self.title)
+
+    def pointer(self):
+        values = self._shell("getmouselocation", "--shell")
+        return int(values["X"]), int(values["Y"])
+
+    def close(self):
+        pass
+
+
+def get_tracker(title="Autodesk Fusion"):
+    """The best window tracker that works here, or None."""
+    if os.environ.get("DISPLAY"):
+        try:
+            return XlibTracker(title)
+        except f360_inject.InjectionError:
+            pass
+    try:
+        return XdotoolTracker(title)
+    except f360_inject.InjectionError:
+        return None
+
+
+class MacroBackend(f360_inject.Backend):
+    """Wraps a backend: resolves the targets to screen positions and runs macros as one batch."""
+
+    def __init__(self, inner, tracker, targets):
+        self.inner = inner
+        self.tracker = tracker
+        self.targets = targets
+        self._layout = None
+
+    @property
+    def name(self):
+        return self.inner.name
+
+    @property
+    def timeout(self):
+        return self.inner.timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self.inner.timeout = value
+
+    def _resolve(self, name):
+        if self._layout is None:
+            self._layout = self.tracker.layout()
+        return resolve(self.targets.get(name, self._layout), self.tracker.geometry())
+
+    def key(self, chord):
+        self.inner.key(chord)
+
+    def click(self, x, y, button=1):
+        self.inner.click(x, y, button)
+
+    def target(self, name, button=1):
+        x, y = self._resolve(name)
+        self.inner.click(x, y, button)
+
+    def batch(self, steps):
+        resolved = []
+        for action, args in steps:
+            if action == "target":
+                x, y = self._resolve(args[0])
+                action, args = "click", (x, y) + tuple(args[1:])
+            resolved.append((action, args))
+        self.inner.batch(resolved)
+
+    def close(self):
+        self.tracker.close()
+        self.inner.close()
+
+
+def calibrate(tracker, targets, names, ask=input):
+    """Learn the targets from the mouse position and save them."""
+    layout = tracker.layout()
+    for name in names:
+        ask("Move the mouse over '%s' and press Enter " % name)
+        x, y = tracker.pointer()
+        anchor, dx, dy = targets.learn(name, layout, tracker.geometry(), x, y)
+        print("%s: %+d, %+d from the %s corner" % (name, dx, dy, anchor))
+    targets.save()
+    print("Saved for %s in %s" % (layout, targets.path))
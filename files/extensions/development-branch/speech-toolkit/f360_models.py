@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Model Manager (Linux & Windows)              #
+# Description:  Loads the Vosk models of several languages on demand and keeps the recent ones.    #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:55/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# Every locale has its own model folder: models/de-DE, models/fr-FR, ... (--models-dir), only the
+# model of --locale can be somewhere else (--model). Download them from
+# https://alphacephei.com/vosk/models and unpack them under the name of the locale.
+#
+# Loading a model takes seconds, switching to a loaded one only needs a new recognizer. So the
+# manager keeps the recently used models in memory, until they need more than the budget
+# (--model-cache-mb) - then the least recently used ones are dropped, but never the model the
+# recognizer uses right now. Vosk can't tell how much memory a model takes, the size of its folder
+# is used instead (that is what gets loaded). Models are loaded outside the lock, so a switch to a
+# cached model never waits for a preload.
+
+import collections
+import concurrent.futures
+import os
+import threading
+
+
+class ModelError(Exception):
+    """Raised when the model of a locale can't be loaded."""
+
+
+def model_size(path):
+    """Bytes of all files in a model folder."""
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return size
+
+
+class ModelManager(object):
+    """LRU cache of Vosk models per locale, bounded by a memory budget."""
+
+    def __init__(self, models_dir="models", budget=None, paths=None):
+        self.models_dir = models_dir
+        self.budget = budget
+        self.paths = dict(paths or {})
+        self.counters = {"loaded": 0, "hits": 0, "evicted": 0}
+        # The locale of the running recognizer is never dropped, it stays in memory anyway:
+        self.active = None
+        self._models = collections.OrderedDict()
+        self._sizes = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def path(self, locale):
+        return self.paths.get(locale) or os.path.join(self.models_dir, locale)
+
+    def get(self, locale):
+        """The model of a locale, loaded if it isn't in the cache."""
+        with self._lock:
+            model = self._models.get(locale)
+            if model is not None:
+                self._models.move_to_end(locale)
+                self.counters["hits"] += 1
+                return model
+            future = self._loading.get(locale)
+            if future is None:
+                future = self._loading[locale] = concurrent.futures.Future()
+                loader = True
+            else:
+                loader = False
+        if not loader:
+            # Somebody else loads it already (e.g. --preload), wait for that:
+            return future.result()
+        # Loading takes seconds, so it runs without the lock - cached models can be taken meanwhile:
+        try:
+            model, size = self._load(locale)
+        except ModelError as e:
+            with self._lock:
+                del self._loading[locale]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._loading[locale]
+            self._evict(size)
+            self._models[locale] = model
+            self._sizes[locale] = size
+            self.counters["loaded"] += 1
+        future.set_result(model)
+        return model
+
+    def activate(self, locale):
+        """Mark the model of the running recognizer, so it is kept (and counted) in the cache."""
+        with self._lock:
+            self.active = locale
+
+    def _load(self, locale):
+        path = self.path(locale)
+        if not os.path.isdir(path):
+            raise ModelError("No model for %s in %s (get one from https://alphacephei.com/vosk/models)" % (
+                locale, path))
+        import vosk
+        try:
+            return vosk.Model(path), model_size(path)
+        except Exception as e:
+            raise ModelError("Can't load the model %s: %s" % (path, e))
+
+    def _evict(self, needed):
+        """Drop the least recently used models (never the active one) until needed bytes fit."""
+        if self.budget is None:
+            return
+        for locale in list(self._models):
+            if sum(self._sizes.values()) + needed <= self.budget:
+                break
+            if locale == self.active:
+                continue
+            del self._models[locale]
+            del self._sizes[locale]
+            self.counters["evicted"] += 1
+
+    def loaded(self):
+        """The cached locales, least recently used first, with their sizes in bytes."""
+        with self._lock:
+            return [(locale, self._sizes[locale]) for locale in self._models]
+
+    def __contains__(self, locale):
+        return locale in self._models
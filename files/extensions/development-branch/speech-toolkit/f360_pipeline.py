@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Pipeline (Linux & Windows)                   #
+# Description:  Runs audio capture, speech recognition and the actions in separate stages.         #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:42/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# audio callback --> AudioRing --> RecognitionWorker --> ActionExecutor --> injection backend
+#
+# - The AudioRing is bounded and preallocated: if the recognizer falls behind, the oldest audio
+#   block is dropped and counted as an overrun, so the memory use stays flat and new speech isn't
+#   seconds late. The blocks are copied into fixed slots and read back as memoryviews, so the audio
+#   thread doesn't allocate anything while you talk (only the hand-off to Vosk wraps each block).
+# - The RecognitionWorker only decodes, it never waits for an action. With a VoiceGate (--vad)
+#   silent blocks are skipped and the recognizer is flushed when the speech ends. It doesn't write
+#   to the disk either, the recordings (--filename) are written by the Recorder thread.
+# - The ActionExecutor runs the actions one after another. An action that waited longer than the
+#   timeout is dropped (it would surprise you by now), and the backend gets the same timeout for
+#   its xdotool/script calls.
+
+import array
+import collections
+import concurrent.futures
+import queue
+import sys
+import threading
+import time
+
+import f360_commands
+import f360_recognition
+import f360_vad
+
+
+class AudioRing(object):
+    """Preallocated ring of int16 audio blocks that drops the oldest block when it is full.
+
+    The audio thread copies each block into a free slot (put), the recognizer gets the slots back
+    as memoryviews (get). The ring itself allocates nothing per block; handing the block to Vosk
+    still creates one small cffi wrapper per block (see Recognizer.accept and bench_ringbuffer.py).
+    A slot returned by get stays valid until the next call of get or release.
+    """
+
+    def __init__(self, slots=20, blocksize=8000, channels=1, timestamps=False):
+        self.slots = slots
+        self.block_bytes = blocksize * channels * 2
+        self.overruns = 0
+        # Remember when each block arrived (for the statistics):
+        self.timestamps = timestamps
+        self._stamps = array.array("d", [0.0] * (slots + 1))
+        # One more slot than can be queued, for the block the recognizer is working on:
+        self._buffer = bytearray(self.block_bytes * (slots + 1))
+        view = memoryview(self._buffer)
+        self._views = [view[i * self.block_bytes:(i + 1) * self.block_bytes] for i in range(slots + 1)]
+        # Length of the slots that hold a short block (only with a variable block size). Reading an
+        # array item > 256 would allocate an int, so full slots are only marked in _short:
+        self._short = bytearray(slots + 1)
+        self._lengths = array.array("l", [0] * (slots + 1))
+        self._free = array.array("l", range(slots, -1, -1))
+        self._nfree = slots + 1
+        self._queued = array.array("l", [0] * slots)
+        self._head = 0
+        self._count = 0
+        self._held = -1
+        self._lock = threading.Lock()
+        # Used as a binary semaphore: released by put when there is new audio. Unlike a Condition
+        # it doesn't allocate a new lock for every wait.
+        self._signal = threading.Lock()
+        self._signal.acquire()
+
+    def put(self, data):
+        """Copy a block into the ring. Never blocks, so it is safe to call from the audio callback."""
+        # acquire/release instead of "with": the with statement allocates a bound method per call.
+        self._lock.acquire()
+        try:
+            if self._count == self.slots:
+                # Full: reuse the slot of the oldest queued block.
+                slot = self._queued[self._head]
+                self._head = (self._head + 1) % self.slots
+                self._count -= 1
+                self.overruns += 1
+            else:
+                self._nfree -= 1
+                slot = self._free[self._nfree]
+            if self.timestamps:
+                self._stamps[slot] = time.monotonic()
+            try:
+                self._views[slot][:] = data
+                self._short[slot] = 0
+            except ValueError:
+                # A short (or too long) block, only happens with a variable block size:
+                data = memoryview(data).cast("B")[:self.block_bytes]
+                self._views[slot][:len(data)] = data
+                self._short[slot] = 1
+                self._lengths[slot] = len(data)
+            self._queued[(self._head + self._count) % self.slots] = slot
+            self._count += 1
+        finally:
+            self._lock.release()
+        if self._signal.locked():
+            self._signal.release()
+
+    def get(self, timeout=None):
+        """Return the oldest block as memoryview, or None if there was none within the timeout."""
+        self.release()
+        deadline = None
+        while True:
+            self._lock.acquire()
+            try:
+                if self._count:
+                    slot = self._held = self._queued[self._head]
+                    self._head = (self._head + 1) % self.slots
+                    self._count -= 1
+                    if self._short[slot]:
+                        return self._views[slot][:self._lengths[slot]]
+                    return self._views[slot]
+            finally:
+                self._lock.release()
+            if timeout is None:
+                self._signal.acquire()
+                continue
+            if deadline is None:
+                deadline = time.monotonic() + timeout
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._signal.acquire(timeout=remaining):
+                return None
+
+    def stamp(self):
+        """time.monotonic() of the arrival of the last block returned by get (with timestamps)."""
+        return self._stamps[self._held] if self._held >= 0 else None
+
+    def release(self):
+        """Give the slot of the last block back to the ring."""
+        self._lock.acquire()
+        try:
+            if self._held >= 0:
+                self._free[self._nfree] = self._held
+                self._nfree += 1
+                self._held = -1
+        finally:
+            self._lock.release()
+
+    def __len__(self):
+        return self._count
+
+
+class ActionExecutor(threading.Thread):
+    """Runs the commands through the injection backend on its own thread."""
+
+    def __init__(self, backend, timeout=2.0, maxsize=32, stats=None):
+        super(ActionExecutor, self).__init__(name="f360-actions", daemon=True)
+        self.backend = backend
+        self.timeout = timeout
+        self.stats = stats
+        self.counters = {"run": 0, "stale": 0, "failed": 0, "dropped": 0}
+        self._actions = queue.Queue(maxsize)
+        self._stopped = threading.Event()
+        if timeout:
+            backend.timeout = timeout
+
+    def submit(self, command, captured=None):
+        """Queue a command. Never blocks the caller. captured is the arrival time of its audio."""
+        try:
+            self._actions.put_nowait((time.monotonic(), command, captured))
+        except queue.Full:
+            self.counters["dropped"] += 1
+
+    def stop(self):
+        """Never blocks either: the queue may be full behind a stalled action."""
+        self._stopped.set()
+        try:
+            self._actions.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                item = self._actions.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is None or self._stopped.is_set():
+                return
+            queued, command, captured = item
+            start = time.monotonic()
+            if self.timeout and start - queued > self.timeout:
+                self.counters["stale"] += 1
+                print("Skipped '%s': waited too long" % command.phrase, file=sys.stderr)
+                continue
+            _execute(self.backend, command, self.counters)
+            if self.stats is not None:
+                end = time.monotonic()
+                self.stats.record("wait", start - queued)
+                self.stats.record("action", end - start)
+                if captured is not None:
+                    self.stats.record("total", end - captured)
+
+
+class ImmediateExecutor(object):
+    """Runs the commands right away on the calling thread (for the replay and the benchmarks)."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.counters = {"run": 0, "stale": 0, "failed": 0, "dropped": 0}
+        # (time.monotonic(), command) of every command that was submitted:
+        self.log = []
+
+    def submit(self, command, captured=None):
+        self.log.append((time.monotonic(), command))
+        _execute(self.backend, command, self.counters)
+
+
+def _execute(backend, command, counters):
+    try:
+        command.run(backend)
+    except Exception as e:
+        counters["failed"] += 1
+        print("Command '%s' failed: %s: %s" % (command.phrase, type(e).__name__, e), file=sys.stderr)
+    else:
+        counters["run"] += 1
+
+
+class RecognitionWorker(threading.Thread):
+    """Takes the audio blocks from the capture queue, decodes them and hands the commands on."""
+
+    def __init__(self, recognizer, capture, executor, recorder=None, gate=None, stats=None):
+        super(RecognitionWorker, self).__init__(name="f360-recognition", daemon=True)
+        self.recognizer = recognizer
+        self.capture = capture
+        self.executor = executor
+        self.recorder = recorder
+        if recorder is not None:
+            recognizer.on_final = recorder.utterance
+        self.gate = gate
+        self.stats = stats
+        self._captured = None
+        self.error = None
+        self.paused = False
+        self._calls = collections.deque()
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def call(self, function, *args, timeout=5.0):
+        """Run function(*args) on the recognition thread, between two blocks, and return its result."""
+        if not self.is_alive():
+            return function(*args)
+        future = concurrent.futures.Future()
+        self._calls.append((future, function, args))
+        return future.result(timeout)
+
+    def pause(self):
+        """Stop listening: the audio is taken from the ring and thrown away."""
+        self.call(self._pause)
+
+    def resume(self):
+        self.paused = False
+
+    def _pause(self):
+        self.paused = True
+        # Forget the half-spoken utterance instead of running it later:
+        self.recognizer.reset()
+        if self.recorder is not None:
+            self.recorder.utterance("")
+
+    def _run_calls(self):
+        while self._calls:
+            future, function, args = self._calls.popleft()
+            try:
+                future.set_result(function(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def run(self):
+        try:
+            while not self._stopped.is_set():
+                data = self.capture.get(timeout=0.5)
+                if self._calls:
+                    self._run_calls()
+                if data is None or self.paused:
+                    continue
+                if self.stats is not None:
+                    self._captured = self.capture.stamp()
+                    self.stats.record("queue", time.monotonic() - self._captured)
+                self.process(data)
+        except Exception as e:
+            self.error = e
+
+    def process(self, data):
+        """Decode one block. The replay calls this directly, without starting the thread."""
+        if self.gate is None:
+            self._decode(data)
+        else:
+            self._gated(data)
+        if self.recorder is not None and not self.recorder.speech_only:
+            self.recorder.write(data)
+
+    def finish(self):
+        """End the current utterance, e.g. at the end of a replayed file."""
+        self._submit(self.recognizer.flush())
+
+    def _gated(self, data):
+        state = self.gate.process(data)
+        if state == f360_vad.ONSET:
+            for block in self.gate.preroll():
+                self._decode(block)
+        if state == f360_vad.ONSET or state == f360_vad.SPEECH:
+            self._decode(data)
+        elif state == f360_vad.END:
+            self._submit(self.recognizer.flush())
+
+    def _decode(self, data):
+        # Only the decoded audio belongs to an utterance (the recorder copies the block):
+        if self.recorder is not None and self.recorder.speech_only:
+            self.recorder.write(data)
+        self._submit(self.recognizer.accept(data))
+
+    def _submit(self, command):
+        if command is not None:
+            self.executor.submit(command, self._captured)
+
+
+def add_recognition_arguments(parser):
+    """Add the options of build_worker to an argparse parser (shared with the benchmarks)."""
+    parser.add_argument(
+        '-g', '--grammar', action='store_true',
+        help='only listen for the command phrases instead of the full vocabulary of the model (less CPU)')
+    parser.add_argument(
+        '-w', '--workspace', type=str, default=f360_commands.ALL_WORKSPACES,
+        help='workspace to start in for the grammar mode, e.g. design, sketch or mesh (default: all)')
+    parser.add_argument(
+        '-e', '--early', action='store_true',
+        help='run a command from the partial results as soon as it is clear which one it is (lower latency)')
+    parser.add_argument(
+        '--early-stability', type=int, default=2, metavar='N',
+        help='early mode: how many identical partial results in a row are needed (default: 2)')
+    parser.add_argument(
+        '--early-coverage', type=float, default=1.0, metavar='FRACTION',
+        help='early mode: part of the phrase that must be spoken, 1.0 = the whole phrase (default: 1.0)')
+    parser.add_argument(
+        '--blocksize', type=int, default=8000, metavar='FRAMES',
+        help='frames per audio block: smaller = lower latency, larger = less CPU overhead (default: 8000)')
+    parser.add_argument(
+        '--vad', action='store_true',
+        help='only decode audio with speech in it, silence never reaches the recognizer (needs NumPy)')
+    parser.add_argument(
+        '--vad-threshold', type=float, default=-45.0, metavar='DBFS',
+        help='VAD: minimum loudness of speech in dBFS, raised automatically in loud rooms (default: -45)')
+    parser.add_argument(
+        '--vad-hangover', type=int, default=500, metavar='MS',
+        help='VAD: keep decoding this long after the speech, before the recognizer is flushed (default: 500)')
+    parser.add_argument(
+        '--vad-preroll', type=int, default=300, metavar='MS',
+        help='VAD: audio before the speech onset that is decoded too, so words are not clipped (default: 300)')
+
+
+def build_worker(model, samplerate, commands, capture, executor, options, recorder=None, verbose=True,
+                 stats=None):
+    """Create the recognizer, the voice gate and the worker from the command line options."""
+    rec = f360_recognition.Recognizer(model, samplerate, commands,
+                                      grammar=options.grammar, workspace=options.workspace,
+                                      early=options.early, stability=options.early_stability,
+                                      coverage=options.early_coverage, verbose=verbose, stats=stats)
+    if options.vad:
+        gate = f360_vad.VoiceGate(samplerate, options.blocksize, threshold=options.vad_threshold,
+                                  hangover_ms=options.vad_hangover, preroll_ms=options.vad_preroll)
+    else:
+        gate = None
+    return RecognitionWorker(rec, capture, executor, recorder=recorder, gate=gate, stats=stats)
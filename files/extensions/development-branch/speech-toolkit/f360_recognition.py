@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Recognition (Linux & Windows)                #
+# Description:  Feeds the audio into Vosk and turns the recognized text into voice commands.       #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:40/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# In grammar mode Kaldi only decodes against the phrases of the command table (plus "[unk]" for
+# everything else) instead of the full vocabulary of the model. That needs less CPU per audio block
+# and avoids misfires. The grammar follows the workspace you are in ("fusion sketch workspace", ...).
+#
+# In early mode a command already fires from the partial results, as soon as the same partial was
+# seen "stability" times in a row and its words lead to exactly one command (and at least
+# "coverage" of the phrase was spoken). The final result of that utterance is then suppressed, so
+# the command never runs twice (of a macro that starts with it, only the other steps run). Workspace
+# switches always wait for the final result.
+
+import json
+import time
+
+import f360_commands
+
+
+class Recognizer(object):
+    """Wraps a Vosk KaldiRecognizer and looks up the command for every final result."""
+
+    def __init__(self, model, samplerate, commands, grammar=False, workspace=None, verbose=True,
+                 early=False, stability=2, coverage=1.0, stats=None):
+        self.model = model
+        self.samplerate = samplerate
+        self.commands = commands
+        self.grammar = grammar
+        self.workspace = None if workspace == f360_commands.ALL_WORKSPACES else workspace
+        self.verbose = verbose
+        self.early = early
+        self.stability = stability
+        self.coverage = coverage
+        self.stats = stats
+        self.matcher = f360_commands.PrefixMatcher(commands) if early else None
+        self.counters = {"early": 0, "final": 0, "suppressed": 0}
+        self._last_partial = None
+        self._stable = 0
+        self._fired = None
+        # Called with (text, command) at the end of every utterance, e.g. by the recorder:
+        self.on_final = None
+        self.rec = self._create()
+        # Vosk (cffi) only takes bytes, the audio ring hands out memoryviews. from_buffer wraps
+        # them without copying the audio - that small wrapper is the one allocation per block left
+        # on the way from the microphone to Vosk:
+        import vosk
+        ffi = getattr(vosk, "_ffi", None)
+        self._from_buffer = ffi.from_buffer if ffi is not None else bytes
+
+    def _create(self):
+        import vosk
+        if self.grammar:
+            return vosk.KaldiRecognizer(self.model, self.samplerate, self.commands.grammar(self.workspace))
+        return vosk.KaldiRecognizer(self.model, self.samplerate)
+
+    def set_workspace(self, workspace):
+        """Switch to the commands of another workspace (only changes something in grammar mode)."""
+        if workspace == f360_commands.ALL_WORKSPACES:
+            workspace = None
+        if workspace == self.workspace:
+            return
+        self.workspace = workspace
+        if self.grammar:
+            if hasattr(self.rec, "SetGrammar"):
+                self.rec.SetGrammar(self.commands.grammar(workspace))
+            else:
+                # Older Vosk versions can only set the grammar when the recognizer is created:
+                self.rec = self._create()
+        if self.verbose:
+            print("Workspace: %s" % (workspace or f360_commands.ALL_WORKSPACES))
+
+    def reload(self, commands):
+        """Use another command table (and rebuild the grammar for it)."""
+        self.commands = commands
+        if self.early:
+            self.matcher = f360_commands.PrefixMatcher(commands)
+        if self.grammar:
+            self.rec = self._create()
+
+    def set_model(self, model, commands):
+        """Switch to another model and its command table, e.g. for another language."""
+        self.model = model
+        self.commands = commands
+        if self.early:
+            self.matcher = f360_commands.PrefixMatcher(commands)
+        self._fired = None
+        self._last_partial = None
+        self._stable = 0
+        self.rec = self._create()
+
+    def accept(self, data):
+        """Feed one audio block. Returns the command to run, or None."""
+        if type(data) is not bytes:
+            data = self._from_buffer(data)
+        stats = self.stats
+        if stats is not None:
+            start = time.monotonic()
+        final = self.rec.AcceptWaveform(data)
+        if stats is not None:
+            stats.record("decode", time.monotonic() - start)
+        if final:
+            return self._final(self.rec.Result())
+        partial = self.rec.PartialResult()
+        if self.verbose:
+            print(partial)
+        if self.early:
+            return self._partial(partial)
+        return None
+
+    def flush(self):
+        """End the current utterance and return its command, or None."""
+        if self.stats is None:
+            return self._final(self.rec.FinalResult())
+        start = time.monotonic()
+        result = self.rec.FinalResult()
+        self.stats.record("decode", time.monotonic() - start)
+        return self._final(result)
+
+    def reset(self):
+        """Throw the current utterance away: nothing is looked up, counted or run."""
+        if hasattr(self.rec, "Reset"):
+            self.rec.Reset()
+        else:
+            # Older Vosk versions have no Reset, ending the utterance does the same:
+            self.rec.FinalResult()
+        self._fired = None
+        self._last_partial = None
+        self._stable = 0
+
+    def _partial(self, result):
+        if self._fired is not None:
+            return None
+        stats = self.stats
+        if stats is not None:
+            start = time.monotonic()
+        text = json.loads(result).get("partial", "")
+        if stats is not None:
+            stats.record("parse", time.monotonic() - start)
+        if text != self._last_partial:
+            self._last_partial = text
+            self._stable = 1
+        else:
+            self._stable += 1
+        if not text or self._stable < self.stability:
+            return None
+        if stats is not None:
+            start = time.monotonic()
+        match = self.matcher.match(f360_commands.normalize(text))
+        if stats is not None:
+            stats.record("dispatch", time.monotonic() - start)
+        if match is None:
+            return None
+        command, coverage = match
+        if coverage < self.coverage or command.action not in f360_commands.BACKEND_ACTIONS:
+            return None
+        self._fired = command
+        self.counters["early"] += 1
+        if stats is not None:
+            stats.command(command.phrase, "early")
+        return command
+
+    def _final(self, result):
+        fired = self._fired
+        self._fired = None
+        self._last_partial = None
+        self._stable = 0
+        stats = self.stats
+        if stats is not None:
+            start = time.monotonic()
+        text = json.loads(result).get("text", "")
+        if stats is not None:
+            parsed = time.monotonic()
+            stats.record("parse", parsed - start)
+        command = self.commands.lookup(text) if text else None
+        if stats is not None:
+            stats.record("dispatch", time.monotonic() - parsed)
+        if self.on_final is not None:
+            self.on_final(text, command or fired)
+        if fired is not None and command is fired:
+            self.counters["suppressed"] += 1
+            return None
+        if fired is not None and command is not None and command.action == f360_commands.MACRO \
+                and command.args[0] is fired:
+            # The first step of the macro already ran early, only the rest is left:
+            self.counters["suppressed"] += 1
+            command = f360_commands.Command.macro(command.phrase, command.args[1:])
+        if command is None:
+            return None
+        self.counters["final"] += 1
+        if stats is not None:
+            stats.command(command.phrase, "final")
+        if command.action == "switch":
+            self.set_workspace(command.args[0])
+        return command
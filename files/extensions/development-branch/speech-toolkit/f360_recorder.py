@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Recorder (Linux & Windows)                   #
+# Description:  Writes the microphone audio to rotating WAV/FLAC segments in the background.       #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:52/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# The recognizer only hands the blocks to a bounded queue, a background thread does the disk I/O.
+# If the disk can't keep up, blocks are dropped (and counted) - recognition never waits.
+#
+# - Continuous mode: everything is written, a new segment starts after --record-segment seconds or
+#   --record-max-mb, e.g. session-0001.wav, session-0002.wav, ...
+# - Speech only (--record-speech-only): one segment per utterance, with the recognized command
+#   (or text) in a label file next to it (session-0001.wav + session-0001.txt). Utterances without
+#   any text are thrown away. That is the layout bench_replay.py reads.
+#
+# Formats: wav and raw (no dependencies) or flac (needs the soundfile module).
+
+import os
+import queue
+import sys
+import threading
+import wave
+
+
+FORMATS = ("wav", "flac", "raw")
+
+_END = object()
+
+
+class RecorderError(Exception):
+    """Raised when a recording can't be written."""
+
+
+class _Segment(object):
+    """One open audio file."""
+
+    def __init__(self, path, samplerate, fmt):
+        self.path = path
+        self.bytes = 0
+        self._format = fmt
+        try:
+            if fmt == "wav":
+                self._file = wave.open(path, "wb")
+                self._file.setnchannels(1)
+                self._file.setsampwidth(2)
+                self._file.setframerate(samplerate)
+            elif fmt == "flac":
+                import soundfile
+                self._file = soundfile.SoundFile(path, "w", samplerate, 1, subtype="PCM_16", format="FLAC")
+            else:
+                self._file = open(path, "wb")
+        except (OSError, RuntimeError) as e:
+            raise RecorderError("Can't write %s: %s" % (path, e))
+
+    def write(self, data):
+        if self._format == "wav":
+            self._file.writeframesraw(data)
+        elif self._format == "flac":
+            self._file.buffer_write(data, dtype="int16")
+        else:
+            self._file.write(data)
+        self.bytes += len(data)
+
+    def close(self):
+        self._file.close()
+
+
+class Recorder(object):
+    """Background writer for the audio blocks, with rotating segments."""
+
+    def __init__(self, base, samplerate, fmt="wav", segment_seconds=600, max_bytes=None,
+                 speech_only=False, maxsize=64):
+        if fmt not in FORMATS:
+            raise RecorderError("Unknown recording format: %s (choose from: %s)" % (fmt, ", ".join(FORMATS)))
+        if fmt == "flac":
+            try:
+                import soundfile
+            except ImportError:
+                raise RecorderError("FLAC recordings need the soundfile module (pip install soundfile)")
+        base, ext = os.path.splitext(base)
+        if ext.lstrip(".") not in FORMATS:
+            base += ext
+        self.base = base
+        self.samplerate = samplerate
+        self.format = fmt
+        self.speech_only = speech_only
+        self.max_bytes = max_bytes
+        if segment_seconds:
+            self.max_bytes = min(max_bytes or sys.maxsize, int(segment_seconds * samplerate * 2))
+        self.counters = {"segments": 0, "discarded": 0, "dropped": 0, "bytes": 0}
+        self.error = None
+        self._index = 0
+        self._segment = None
+        self._blocks = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._run, name="f360-recorder", daemon=True)
+        self._thread.start()
+
+    def write(self, data):
+        """Queue an audio block (copied, so a view from the audio ring is fine). Never blocks."""
+        self._put(bytes(data))
+
+    def utterance(self, text, command=None):
+        """End of an utterance: in speech-only mode its segment is kept with a label, or dropped."""
+        if self.speech_only:
+            label = command.phrase if command is not None else text
+            self._put(("end", label))
+
+    def close(self, timeout=5.0):
+        """Write everything that is still queued and close the last segment."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._blocks.put(_END, timeout=timeout)
+        except queue.Full:
+            print("Recording: the writer is stuck, the last blocks are lost", file=sys.stderr)
+            return
+        self._thread.join(timeout)
+
+    def _put(self, item):
+        try:
+            self._blocks.put_nowait(item)
+        except queue.Full:
+            self.counters["dropped"] += 1
+
+    def _run(self):
+        while True:
+            item = self._blocks.get()
+            if item is _END:
+                break
+            try:
+                if type(item) is tuple:
+                    self._finish(item[1])
+                else:
+                    self._write(item)
+            except (RecorderError, OSError) as e:
+                self._fail(e)
+        try:
+            self._finish(None if self.speech_only else "")
+        except (RecorderError, OSError) as e:
+            self._fail(e)
+
+    def _fail(self, e):
+        # Keep emptying the queue (a full disk must not block anybody), but report it only once:
+        segment = self._segment
+        self._segment = None
+        if segment is not None:
+            try:
+                segment.close()
+            except Exception:
+                pass
+        if self.error is None:
+            self.error = e
+            print("Recording stopped: %s" % e, file=sys.stderr)
+
+    def _write(self, data):
+        if self.error is not None:
+            return
+        if self._segment is None:
+            self._index += 1
+            path = "%s-%04d.%s" % (self.base, self._index, self.format)
+            if self.speech_only:
+                path += ".part"
+            self._segment = _Segment(path, self.samplerate, self.format)
+        self._segment.write(data)
+        self.counters["bytes"] += len(data)
+        if self.max_bytes and self._segment.bytes >= self.max_bytes:
+            # Too long for one utterance in speech-only mode - that was no command:
+            self._finish(None if self.speech_only else "")
+
+    def _finish(self, label):
+        """Close the current segment. label None drops it, a text is written next to it."""
+        segment = self._segment
+        self._segment = None
+        if segment is None:
+            return
+        segment.close()
+        if not self.speech_only:
+            self.counters["segments"] += 1
+            return
+        if not label:
+            os.unlink(segment.path)
+            self._index -= 1
+            self.counters["discarded"] += 1
+            return
+        path = segment.path[:-len(".part")]
+        os.rename(segment.path, path)
+        with open(os.path.splitext(path)[0] + ".txt", "w", encoding="utf-8") as f:
+            f.write(label + "\n")
+        self.counters["segments"] += 1
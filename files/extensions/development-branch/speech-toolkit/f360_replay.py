@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Replay (Linux & Windows)                     #
+# Description:  Streams recorded audio files through the recognition and dispatch path.            #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:49/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# Plays WAV and FLAC files or the raw int16 recordings of --filename back through the same
+# recognizer, voice gate and command table as the live toolkit - without a microphone or an X
+# server. The commands go to the recording backend, so nothing is sent to Fusion 360.
+#
+#   python3 f360-speechtoolkit.py --replay recording.raw -r 16000 --grammar --vad
+#
+# The replay runs much faster than real time, so the latency is measured in audio time: from the
+# end of the spoken utterance to the end of the audio block after which the command was dispatched.
+# That includes the block size, the endpointing of Vosk and the hangover of the voice gate. The
+# processing time (wall time of the decode call that dispatched the command) comes on top live.
+#
+# The utterances are found like the voice gate does it: 20 ms frames whose mean energy is above
+# --vad-threshold, for at least 60 ms in a row - so a keyboard click or a pop is no utterance.
+
+import array
+import operator
+import time
+import wave
+
+import f360_inject
+import f360_pipeline
+
+
+class ReplayError(Exception):
+    """Raised when an audio file can't be replayed."""
+
+
+def read_audio(path, samplerate=None):
+    """Return (samplerate, int16 mono PCM) of a WAV or FLAC file or a headerless raw file."""
+    if path.lower().endswith(".flac"):
+        try:
+            import soundfile
+        except ImportError:
+            raise ReplayError("%s: FLAC needs the soundfile module (pip install soundfile)" % path)
+        try:
+            with soundfile.SoundFile(path) as f:
+                if f.channels != 1:
+                    raise ReplayError("%s: only mono is supported" % path)
+                return f.samplerate, bytes(f.buffer_read(dtype="int16"))
+        except (OSError, RuntimeError) as e:
+            raise ReplayError("Can't read %s: %s" % (path, e))
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(path, "rb") as f:
+                if f.getnchannels() != 1 or f.getsampwidth() != 2 or f.getcomptype() != "NONE":
+                    raise ReplayError("%s: only 16 bit mono PCM is supported" % path)
+                return f.getframerate(), f.readframes(f.getnframes())
+        except (OSError, EOFError, wave.Error) as e:
+            raise ReplayError("Can't read %s: %s" % (path, e))
+    if samplerate is None:
+        raise ReplayError("%s: a raw recording needs the sampling rate (-r)" % path)
+    try:
+        with open(path, "rb") as f:
+            return samplerate, f.read()
+    except OSError as e:
+        raise ReplayError("Can't read %s: %s" % (path, e))
+
+
+def speech_segments(data, samplerate, threshold=-45.0, frame_ms=20, min_ms=60, gap_ms=300):
+    """(start, end) in seconds of the utterances in int16 mono PCM.
+
+    An utterance is at least min_ms of frames with a mean energy above threshold (dBFS), pauses
+    shorter than gap_ms are joined.
+    """
+    samples = array.array("h")
+    samples.frombytes(bytes(data[:len(data) // 2 * 2]))
+    frame = max(1, samplerate * frame_ms // 1000)
+    # Sum of the squared samples of a frame at the threshold:
+    level = frame * 32768.0 * 32768.0 * 10 ** (threshold / 10.0)
+    min_frames = max(1, min_ms // frame_ms)
+    gap = gap_ms / 1000.0
+    segments = []
+    loud = 0
+    for i in range(0, len(samples) - frame + 1, frame):
+        chunk = samples[i:i + frame]
+        if sum(map(operator.mul, chunk, chunk)) <= level:
+            loud = 0
+            continue
+        loud += 1
+        if loud < min_frames:
+            continue
+        start = (i - (loud - 1) * frame) / float(samplerate)
+        end = (i + frame) / float(samplerate)
+        if segments and start - segments[-1][1] <= gap:
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((start, end))
+    return segments
+
+
+class ReplayResult(object):
+    """What happened while one file was replayed.
+
+    commands holds (audio time in seconds, command) of every dispatched command, processing the wall
+    time of the decode call that dispatched it and speech the (start, end) of the utterances.
+    """
+
+    __slots__ = ("path", "audio", "decode", "commands", "processing", "speech", "counters")
+
+    def __init__(self, path, audio, decode, commands, processing, speech, counters):
+        self.path = path
+        self.audio = audio
+        self.decode = decode
+        self.commands = commands
+        self.processing = processing
+        self.speech = speech
+        self.counters = counters
+
+    @property
+    def rtf(self):
+        """Real-time factor: decode time / audio duration (< 1 is faster than real time)."""
+        return self.decode / self.audio if self.audio else 0.0
+
+    def latencies(self):
+        """Audio seconds from the end of its utterance to each command (negative = fired before the end).
+
+        A command belongs to the last utterance that started before it, or the end of the file if
+        no speech was found.
+        """
+        latencies = []
+        for dispatched, command in self.commands:
+            end = self.audio
+            for start, stop in self.speech:
+                if start > dispatched:
+                    break
+                end = stop
+            latencies.append(dispatched - end)
+        return latencies
+
+
+def replay(model, commands, path, options, backend=None, verbose=False):
+    """Stream one audio file through a fresh recognizer and return a ReplayResult."""
+    samplerate, data = read_audio(path, options.samplerate)
+    if backend is None:
+        backend = f360_inject.RecordingBackend(verbose=verbose)
+    executor = f360_pipeline.ImmediateExecutor(backend)
+    worker = f360_pipeline.build_worker(model, samplerate, commands, None, executor, options, verbose=False)
+    step = options.blocksize * 2
+    audio = len(data) / 2.0 / samplerate
+    view = memoryview(data)
+    commands = []
+    processing = []
+
+    def dispatched(position, took):
+        # The commands that came out of the last call happened at the end of its audio:
+        for logged, command in executor.log[len(commands):]:
+            commands.append((position, command))
+            processing.append(took)
+
+    decode = 0.0
+    for offset in range(0, len(view), step):
+        start = time.monotonic()
+        worker.process(view[offset:offset + step])
+        took = time.monotonic() - start
+        decode += took
+        dispatched(min(offset + step, len(view)) / 2.0 / samplerate, took)
+    start = time.monotonic()
+    worker.finish()
+    took = time.monotonic() - start
+    decode += took
+    dispatched(audio, took)
+    counters = dict(worker.recognizer.counters)
+    counters.update(executor.counters)
+    if worker.gate is not None:
+        counters["vad_skipped"] = worker.gate.skipped_fraction
+    speech = speech_segments(data, samplerate, options.vad_threshold)
+    return ReplayResult(path, audio, decode, commands, processing, speech, counters)
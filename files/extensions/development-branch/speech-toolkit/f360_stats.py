@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Statistics (Linux & Windows)                 #
+# Description:  Latency histograms per stage and command counters, served over a Unix socket.      #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:50/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# Stages (all measured with time.monotonic()):
+#
+#   queue     audio callback -> block taken by the recognizer
+#   decode    AcceptWaveform / FinalResult
+#   parse     JSON parsing of the Vosk results
+#   dispatch  command lookup
+#   wait      command found -> action started
+#   action    injection backend (xdotool, XTEST, ...)
+#   total     audio callback of the last block -> action done
+#
+# With --stats-socket the numbers are served over HTTP on a Unix socket:
+#
+#   curl --unix-socket /run/user/1000/f360-speechtoolkit-stats.sock http://localhost/metrics
+#   curl --unix-socket /run/user/1000/f360-speechtoolkit-stats.sock http://localhost/stats
+#
+# /metrics is the Prometheus text format, /stats is JSON.
+
+import http.server
+import json
+import os
+import socket
+import socketserver
+import threading
+
+
+STAGES = ("queue", "decode", "parse", "dispatch", "wait", "action", "total")
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class Histogram(object):
+    """HDR-style log-linear histogram of durations with about 3% precision.
+
+    Values are kept in microseconds: every power of two is split into 32 linear sub-buckets, so
+    recording is one index calculation and one list increment, whatever the range.
+    """
+
+    SUB_BITS = 5
+
+    def __init__(self, max_exponent=36):
+        self.sub = 1 << self.SUB_BITS
+        self.counts = [0] * ((max_exponent + 2) * self.sub)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def _index(self, us):
+        if us < 2 * self.sub:
+            return us
+        exponent = us.bit_length() - self.SUB_BITS - 1
+        return min((exponent + 1) * self.sub + (us >> exponent) - self.sub, len(self.counts) - 1)
+
+    def _value(self, index):
+        """Upper limit (in microseconds) of a bucket."""
+        if index < 2 * self.sub:
+            return index
+        exponent = index // self.sub - 1
+        return ((index % self.sub + self.sub + 1) << exponent) - 1
+
+    def record(self, seconds):
+        us = int(seconds * 1e6)
+        if us < 0:
+            us = 0
+        self.counts[self._index(us)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Duration in seconds below which q of all values are."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(self._value(index) / 1e6, self.max)
+        return self.max
+
+    def to_dict(self):
+        result = {"count": self.count, "sum": self.sum, "max": self.max}
+        for q in QUANTILES:
+            result["p%g" % (q * 100)] = self.quantile(q)
+        return result
+
+
+class Stats(object):
+    """Latency histograms per stage, counters per command and other counters of the toolkit."""
+
+    def __init__(self):
+        self.stages = dict((stage, Histogram()) for stage in STAGES)
+        self.commands = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        self.stages[stage].record(seconds)
+
+    def command(self, phrase, trigger):
+        """Count a recognized command; trigger is "early" or "final"."""
+        key = (phrase, trigger)
+        with self._lock:
+            self.commands[key] = self.commands.get(key, 0) + 1
+
+    def add_counters(self, name, counters, gauges=()):
+        """Publish a counter dict (or a function that returns one) under a name. The keys in gauges
+        are current values (e.g. a queue length) instead of counters that only grow."""
+        self._counters[name] = counters
+        self._gauges[name] = frozenset(gauges)
+
+    def counters(self):
+        result = {}
+        for name, counters in self._counters.items():
+            if callable(counters):
+                counters = counters()
+            result[name] = dict(counters)
+        return result
+
+    def to_dict(self):
+        with self._lock:
+            commands = [{"phrase": phrase, "trigger": trigger, "count": count}
+                        for (phrase, trigger), count in sorted(self.commands.items())]
+        return {
+            "stages": dict((stage, histogram.to_dict()) for stage, histogram in self.stages.items()),
+            "commands": commands,
+            "counters": self.counters(),
+        }
+
+    def prometheus(self):
+        """All numbers in the Prometheus text format."""
+        lines = [
+            "# HELP f360_stage_latency_seconds Latency of each stage of the speech toolkit.",
+            "# TYPE f360_stage_latency_seconds summary",
+        ]
+        for stage, histogram in self.stages.items():
+            for q in QUANTILES:
+                lines.append('f360_stage_latency_seconds{stage="%s",quantile="%g"} %.6f' % (
+                    stage, q, histogram.quantile(q)))
+            lines.append('f360_stage_latency_seconds_sum{stage="%s"} %.6f' % (stage, histogram.sum))
+            lines.append('f360_stage_latency_seconds_count{stage="%s"} %d' % (stage, histogram.count))
+        lines.append("# HELP f360_commands_total Recognized voice commands.")
+        lines.append("# TYPE f360_commands_total counter")
+        with self._lock:
+            commands = sorted(self.commands.items())
+        for (phrase, trigger), count in commands:
+            lines.append('f360_commands_total{phrase="%s",trigger="%s"} %d' % (_escape(phrase), trigger, count))
+        for name, counters in sorted(self.counters().items()):
+            gauges = self._gauges.get(name, ())
+            for key, value in sorted(counters.items()):
+                if key in gauges:
+                    metric, kind = "f360_%s_%s" % (name, key), "gauge"
+                else:
+                    metric, kind = "f360_%s_%s_total" % (name, key), "counter"
+                lines.append("# TYPE %s %s" % (metric, kind))
+                # %g would round large counters (bytes) to 6 digits:
+                lines.append("%s %s" % (metric, value if isinstance(value, int) else repr(float(value))))
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def default_socket(name="f360-speechtoolkit-stats.sock"):
+    """Path of the socket in the runtime folder of the user."""
+    return os.path.join(os.environ.get("XDG_RUNTIME_DIR") or "/tmp", name)
+
+
+def claim_socket(path):
+    """Remove a stale socket file - but refuse, if another process still answers on it."""
+    if not os.path.exists(path):
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        # Nobody listens any more:
+        os.unlink(path)
+    else:
+        raise OSError("%s is in use by another speech toolkit" % path)
+    finally:
+        sock.close()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        stats = self.server.stats
+        if self.path.rstrip("/") == "/metrics":
+            self._send(stats.prometheus(), "text/plain; version=0.0.4")
+        elif self.path.rstrip("/") in ("", "/stats"):
+            self._send(json.dumps(stats.to_dict(), indent=2) + "\n", "application/json")
+        else:
+            self.send_error(404)
+
+    def _send(self, body, content_type):
+        body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StatsServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves /metrics and /stats of a Stats object over HTTP on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, stats, path):
+        claim_socket(path)
+        socketserver.UnixStreamServer.__init__(self, path, _Handler)
+        os.chmod(path, 0o600)
+        self.stats = stats
+        self.path = path
+        self._thread = threading.Thread(target=self.serve_forever, name="f360-stats", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
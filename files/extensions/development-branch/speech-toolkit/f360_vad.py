@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+# Name:         Autodesk Fusion 360 - Speechtoolkit - Voice Activity Gate (Linux & Windows)        #
+# Description:  Keeps silence and keyboard noise away from the Kaldi decoder.                      #
+# Author:       agent                                                                              #
+# Author URI:   agent@local                                                                        #
+# License:      MIT                                                                                #
+# Copyright (c) 2026                                                                               #
+# Time/Date:    10:47/18.10.2026                                                                   #
+# Version:      0.0.1                                                                              #
+####################################################################################################
+
+# Every audio block is cut into short frames (20 ms). A frame counts as voiced if it is louder than
+# the threshold and its zero-crossing rate is low enough (keyboard clicks and hiss cross zero far
+# more often than speech). A block with enough voiced frames is speech.
+#
+# - SKIP:   silence, the block is not decoded (but kept for the pre-roll)
+# - ONSET:  speech starts - decode the pre-roll first, so the start of the word isn't clipped
+# - SPEECH: decode the block
+# - END:    the hangover after the last speech ran out - flush the recognizer
+#
+# The threshold follows the noise floor of the room (never below --vad-threshold).
+
+import math
+
+
+SKIP = 0
+ONSET = 1
+SPEECH = 2
+END = 3
+
+
+class VoiceGate(object):
+    """Vectorized energy / zero-crossing voice activity detection for int16 mono blocks."""
+
+    def __init__(self, samplerate, blocksize, threshold=-45.0, margin=10.0, zcr_max=0.35,
+                 hangover_ms=500, preroll_ms=300, frame_ms=20, min_frames=3):
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("The voice activity gate needs NumPy (pip install numpy)")
+        self._np = numpy
+        self.threshold = threshold
+        self.margin = margin
+        self.zcr_max = zcr_max
+        self.min_frames = min_frames
+        self.frame = max(1, samplerate * frame_ms // 1000)
+        block_ms = 1000.0 * blocksize / samplerate
+        self.hangover_blocks = int(math.ceil(hangover_ms / block_ms))
+        self.noise_floor = threshold - margin
+        self.blocks = 0
+        self.skipped = 0
+        self._hangover = 0
+        self._speaking = False
+
+        # Copies of the last skipped blocks, in preallocated slots:
+        self._block_bytes = blocksize * 2
+        self._preroll_slots = int(math.ceil(preroll_ms / block_ms)) if preroll_ms > 0 else 0
+        self._preroll = bytearray(self._block_bytes * self._preroll_slots)
+        view = memoryview(self._preroll)
+        self._preroll_views = [view[i * self._block_bytes:(i + 1) * self._block_bytes]
+                               for i in range(self._preroll_slots)]
+        self._preroll_next = 0
+        self._preroll_count = 0
+
+    @property
+    def skipped_fraction(self):
+        """Part of all blocks that never reached the decoder."""
+        return self.skipped / float(self.blocks) if self.blocks else 0.0
+
+    def _analyze(self, data):
+        """Return (voiced frames, median frame energy in dBFS) of a block."""
+        np = self._np
+        samples = np.frombuffer(data, dtype=np.int16)
+        frames = len(samples) // self.frame
+        if not frames:
+            return 0, -100.0
+        x = samples[:frames * self.frame].reshape(frames, self.frame).astype(np.float32)
+        energy = 10.0 * np.log10(np.mean(x * x, axis=1) / (32768.0 * 32768.0) + 1e-10)
+        signs = np.signbit(x)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+        threshold = max(self.threshold, self.noise_floor + self.margin)
+        voiced = int(np.count_nonzero((energy > threshold) & (zcr < self.zcr_max)))
+        return voiced, float(np.median(energy))
+
+    def process(self, data):
+        """Classify one block, returns SKIP, ONSET, SPEECH or END."""
+        self.blocks += 1
+        voiced, level = self._analyze(data)
+        if voiced >= self.min_frames:
+            self._hangover = self.hangover_blocks
+            if not self._speaking:
+                self._speaking = True
+                return ONSET
+            return SPEECH
+        if self._speaking:
+            if self._hangover > 0:
+                self._hangover -= 1
+                return SPEECH
+            self._speaking = False
+            self._remember(data, level)
+            return END
+        self._remember(data, level)
+        return SKIP
+
+    def _remember(self, data, level):
+        self.skipped += 1
+        self.noise_floor = 0.95 * self.noise_floor + 0.05 * level
+        if not self._preroll_slots:
+            return
+        try:
+            self._preroll_views[self._preroll_next][:] = data
+        except ValueError:
+            # A block of another size can't be kept, start over:
+            self._preroll_count = 0
+            return
+        self._preroll_next = (self._preroll_next + 1) % self._preroll_slots
+        self._preroll_count = min(self._preroll_count + 1, self._preroll_slots)
+
+    def preroll(self):
+        """Yield the kept blocks before the speech onset (oldest first) and forget them."""
+        count = self._preroll_count
+        self._preroll_count = 0
+        start = (self._preroll_next - count) % self._preroll_slots if count else 0
+        for i in range(count):
+            yield self._preroll_views[(start + i) % self._preroll_slots]